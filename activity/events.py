@@ -0,0 +1,66 @@
+"""
+Writers for the activity log. Events are inserted in the same transaction
+as the change they describe, from the signals in activity.signals (and
+directly by bulk writers such as users.importer, which skip signals).
+"""
+from django.utils import timezone
+
+from .models import ActivityEvent
+
+BOOKING_STATUS_EVENTS = {
+    'CANCELLED': ActivityEvent.BOOKING_CANCELLED,
+    'COMPLETED': ActivityEvent.BOOKING_COMPLETED,
+}
+
+
+def booking_data(booking):
+    return {
+        'id': booking.id,
+        'user_email': booking.user.email,
+        'workspace_name': booking.workspace.name,
+        'status': booking.status,
+        'start_time': booking.start_time.isoformat(),
+        'end_time': booking.end_time.isoformat(),
+        'created_at': booking.created_at.isoformat(),
+    }
+
+
+def workspace_data(workspace):
+    return {
+        'id': workspace.id,
+        'name': workspace.name,
+        'type': workspace.type,
+        'created_at': workspace.created_at.isoformat(),
+    }
+
+
+def user_data(user):
+    return {
+        'id': user.id,
+        'full_name': user.full_name,
+        'email': user.email,
+        'created_at': user.date_joined.isoformat(),
+    }
+
+
+def event(organization_id, type, object_id, data, occurred_at=None):
+    return ActivityEvent(
+        organization_id=organization_id,
+        type=type,
+        object_id=object_id,
+        data=data,
+        occurred_at=occurred_at or timezone.now(),
+    )
+
+
+def record(organization_id, type, object_id, data, occurred_at=None):
+    activity = event(organization_id, type, object_id, data, occurred_at)
+    activity.save()
+    return activity
+
+
+def record_users_joined(users):
+    ActivityEvent.objects.bulk_create([
+        event(user.organization_id, ActivityEvent.USER_JOINED, user.id, user_data(user), user.date_joined)
+        for user in users
+    ])
@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-18 13:27
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('organizations', '0003_activationtoken_password'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(choices=[('booking.created', 'Booking created'), ('booking.cancelled', 'Booking cancelled'), ('booking.completed', 'Booking completed'), ('workspace.created', 'Workspace created'), ('user.joined', 'User joined')], max_length=32)),
+                ('object_id', models.BigIntegerField()),
+                ('data', models.JSONField(default=dict)),
+                ('occurred_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity_events', to='organizations.organization')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['organization', '-occurred_at', '-id'], name='activity_org_time_idx'), models.Index(fields=['organization', 'type', '-occurred_at', '-id'], name='activity_org_type_time_idx')],
+            },
+        ),
+    ]
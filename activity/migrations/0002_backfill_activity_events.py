@@ -0,0 +1,63 @@
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def _booking_data(booking):
+    return {
+        'id': booking.id,
+        'user_email': booking.user.email,
+        'workspace_name': booking.workspace.name,
+        'status': booking.status,
+        'start_time': booking.start_time.isoformat(),
+        'end_time': booking.end_time.isoformat(),
+        'created_at': booking.created_at.isoformat(),
+    }
+
+
+def backfill_events(apps, schema_editor):
+    ActivityEvent = apps.get_model('activity', 'ActivityEvent')
+    Booking = apps.get_model('workspace', 'Booking')
+    Workspace = apps.get_model('workspace', 'Workspace')
+    ClientUser = apps.get_model('users', 'ClientUser')
+
+    def events():
+        for booking in Booking.objects.select_related('user', 'workspace').iterator(chunk_size=BATCH_SIZE):
+            data = _booking_data(booking)
+            yield ActivityEvent(organization_id=booking.organization_id, type='booking.created',
+                                object_id=booking.id, data=data, occurred_at=booking.created_at)
+            # The status change time isn't stored; updated_at is the closest.
+            if booking.status in ('CANCELLED', 'COMPLETED'):
+                yield ActivityEvent(organization_id=booking.organization_id, type=f'booking.{booking.status.lower()}',
+                                    object_id=booking.id, data=data, occurred_at=booking.updated_at)
+        for workspace in Workspace.objects.iterator(chunk_size=BATCH_SIZE):
+            yield ActivityEvent(organization_id=workspace.organization_id, type='workspace.created', object_id=workspace.id,
+                                data={'id': workspace.id, 'name': workspace.name, 'type': workspace.type,
+                                      'created_at': workspace.created_at.isoformat()},
+                                occurred_at=workspace.created_at)
+        for user in ClientUser.objects.iterator(chunk_size=BATCH_SIZE):
+            yield ActivityEvent(organization_id=user.organization_id, type='user.joined', object_id=user.id,
+                                data={'id': user.id, 'full_name': user.full_name, 'email': user.email,
+                                      'created_at': user.date_joined.isoformat()},
+                                occurred_at=user.date_joined)
+
+    batch = []
+    for event in events():
+        batch.append(event)
+        if len(batch) >= BATCH_SIZE:
+            ActivityEvent.objects.bulk_create(batch)
+            batch = []
+    ActivityEvent.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activity', '0001_initial'),
+        ('users', '0010_clientuser_search_indexes'),
+        ('workspace', '0016_booking_daily_stat'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_events, migrations.RunPython.noop),
+    ]
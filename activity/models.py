@@ -0,0 +1,42 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ActivityEvent(models.Model):
+    """
+    Append-only organization activity log. `data` is a snapshot taken when
+    the event happened, so the feed never joins back to the source rows.
+    """
+    BOOKING_CREATED = 'booking.created'
+    BOOKING_CANCELLED = 'booking.cancelled'
+    BOOKING_COMPLETED = 'booking.completed'
+    WORKSPACE_CREATED = 'workspace.created'
+    USER_JOINED = 'user.joined'
+    TYPE_CHOICES = (
+        (BOOKING_CREATED, 'Booking created'),
+        (BOOKING_CANCELLED, 'Booking cancelled'),
+        (BOOKING_COMPLETED, 'Booking completed'),
+        (WORKSPACE_CREATED, 'Workspace created'),
+        (USER_JOINED, 'User joined'),
+    )
+
+    organization = models.ForeignKey('organizations.Organization', on_delete=models.CASCADE, related_name='activity_events')
+    type = models.CharField(max_length=32, choices=TYPE_CHOICES)
+    object_id = models.BigIntegerField()
+    data = models.JSONField(default=dict)
+    occurred_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Every read is scoped to one organization, newest first.
+            models.Index(fields=['organization', '-occurred_at', '-id'], name='activity_org_time_idx'),
+            models.Index(fields=['organization', 'type', '-occurred_at', '-id'], name='activity_org_type_time_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError("Activity events are append-only.")
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.type} {self.object_id} ({self.occurred_at:%Y-%m-%d %H:%M})"
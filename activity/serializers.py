@@ -0,0 +1,9 @@
+from rest_framework import serializers
+
+from .models import ActivityEvent
+
+
+class ActivityEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ActivityEvent
+        fields = ['id', 'type', 'object_id', 'data', 'occurred_at']
@@ -0,0 +1,33 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from users.models import ClientUser
+from workspace.models import Booking, Workspace
+from .events import BOOKING_STATUS_EVENTS, booking_data, record, user_data, workspace_data
+from .models import ActivityEvent
+
+
+@receiver(post_save, sender=Booking)
+def record_booking_activity(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        record(instance.organization_id, ActivityEvent.BOOKING_CREATED, instance.id, booking_data(instance), instance.created_at)
+        return
+    # Set by workspace.signals before the save.
+    previous = getattr(instance, '_previous_snapshot', None)
+    type = BOOKING_STATUS_EVENTS.get(instance.status)
+    if type and previous and previous['status'] != instance.status:
+        record(instance.organization_id, type, instance.id, booking_data(instance), instance.updated_at)
+
+
+@receiver(post_save, sender=Workspace)
+def record_workspace_activity(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        record(instance.organization_id, ActivityEvent.WORKSPACE_CREATED, instance.id, workspace_data(instance), instance.created_at)
+
+
+@receiver(post_save, sender=ClientUser)
+def record_user_activity(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        record(instance.organization_id, ActivityEvent.USER_JOINED, instance.id, user_data(instance), instance.date_joined)
@@ -0,0 +1,117 @@
+import importlib
+from datetime import timedelta
+
+from django.apps import apps as django_apps
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from organizations.models import Organization
+from users.authentication import ADMIN, CLIENT, TenantPrincipal
+from users.models import ClientUser
+from workspace.models import Booking, Workspace
+from .models import ActivityEvent
+from .views import ActivityFeedView
+
+
+class ActivityTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(organization_name="Acme", email="acme@example.com")
+        cls.user = ClientUser.objects.create(organization=cls.organization, full_name="Ada", email="ada@example.com")
+        cls.desk = Workspace.objects.create(organization=cls.organization, name="Desk", type="Desk", capacity=1)
+        cls.start = timezone.now() + timedelta(days=1)
+
+    def book(self, offset=0, **kwargs):
+        start = self.start + timedelta(hours=offset)
+        return Booking.objects.create(
+            workspace=self.desk, user=self.user, start_time=start, end_time=start + timedelta(hours=1), **kwargs
+        )
+
+    def events(self, type):
+        return list(ActivityEvent.objects.filter(type=type).values_list('object_id', flat=True))
+
+
+class ActivitySignalTests(ActivityTestCase):
+    def test_creations_are_recorded(self):
+        booking = self.book()
+
+        self.assertEqual(self.events(ActivityEvent.USER_JOINED), [self.user.id])
+        self.assertEqual(self.events(ActivityEvent.WORKSPACE_CREATED), [self.desk.id])
+        event = ActivityEvent.objects.get(type=ActivityEvent.BOOKING_CREATED)
+        self.assertEqual(event.object_id, booking.id)
+        self.assertEqual(event.organization_id, self.organization.id)
+        self.assertEqual(event.data['workspace_name'], "Desk")
+        self.assertEqual(event.data['user_email'], "ada@example.com")
+
+    def test_status_changes_are_recorded_once(self):
+        booking = self.book()
+
+        booking.status = 'CANCELLED'
+        booking.save()
+        booking.save()
+
+        self.assertEqual(self.events(ActivityEvent.BOOKING_CANCELLED), [booking.id])
+        self.assertEqual(ActivityEvent.objects.get(type=ActivityEvent.BOOKING_CANCELLED).data['status'], 'CANCELLED')
+
+    def test_other_saves_are_not_recorded(self):
+        booking = self.book()
+        count = ActivityEvent.objects.count()
+
+        booking.end_time += timedelta(minutes=30)
+        booking.save()
+        self.desk.capacity = 2
+        self.desk.save()
+
+        self.assertEqual(ActivityEvent.objects.count(), count)
+
+    def test_events_are_append_only(self):
+        event = ActivityEvent.objects.first()
+        with self.assertRaises(ValueError):
+            event.save()
+
+
+class ActivityFeedViewTests(ActivityTestCase):
+    def get(self, user_type, role):
+        request = APIRequestFactory().get('/')
+        request.organization = self.organization
+        request.org_code = self.organization.code
+        force_authenticate(request, user=TenantPrincipal(
+            1, user_type, role, self.organization.id, self.organization.code,
+        ))
+        return ActivityFeedView.as_view()(request, org_code=self.organization.code)
+
+    def test_staff_only(self):
+        self.book()
+
+        self.assertEqual(self.get(CLIENT, 'member').status_code, 403)
+        for user_type, role in ((CLIENT, 'staff'), (ADMIN, 'admin'), (ADMIN, 'super_admin')):
+            with self.subTest(role=role):
+                response = self.get(user_type, role)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(
+                    [event['type'] for event in response.data['results']],
+                    [ActivityEvent.BOOKING_CREATED, ActivityEvent.WORKSPACE_CREATED, ActivityEvent.USER_JOINED],
+                )
+
+
+class BackfillTests(ActivityTestCase):
+    """Migration 0002 seeds the log from the rows that existed before it."""
+
+    def test_backfill_creates_one_event_per_row(self):
+        migration = importlib.import_module('activity.migrations.0002_backfill_activity_events')
+        pending = self.book(0)
+        cancelled = self.book(1, status='CANCELLED')
+        completed = self.book(2, status='COMPLETED')
+        ActivityEvent.objects.all().delete()
+
+        migration.backfill_events(django_apps, None)
+
+        self.assertCountEqual(self.events(ActivityEvent.BOOKING_CREATED), [pending.id, cancelled.id, completed.id])
+        # Finished bookings also get the event for their final status.
+        self.assertEqual(self.events(ActivityEvent.BOOKING_CANCELLED), [cancelled.id])
+        self.assertEqual(self.events(ActivityEvent.BOOKING_COMPLETED), [completed.id])
+        self.assertEqual(self.events(ActivityEvent.WORKSPACE_CREATED), [self.desk.id])
+        self.assertEqual(self.events(ActivityEvent.USER_JOINED), [self.user.id])
+        created = ActivityEvent.objects.get(type=ActivityEvent.BOOKING_CREATED, object_id=pending.id)
+        self.assertEqual(created.occurred_at, pending.created_at)
@@ -0,0 +1,51 @@
+from django.utils.dateparse import parse_datetime
+from rest_framework import generics
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.permissions import IsAuthenticated
+
+from core.pagination import KeysetPagination
+from users.permissions import BelongsToOrganization, IsOrganizationStaff
+from workspace.availability import aware
+from .models import ActivityEvent
+from .serializers import ActivityEventSerializer
+
+
+class ActivityFeedPagination(KeysetPagination):
+    page_size = 50
+    max_page_size = 200
+
+
+class ActivityFeedView(generics.ListAPIView):
+    """
+    The organization's activity log, newest first, keyset paged.
+    ?type= takes one or more comma-separated event types; ?since= and
+    ?until= bound occurred_at.
+    """
+    serializer_class = ActivityEventSerializer
+    pagination_class = ActivityFeedPagination
+    permission_classes = [IsAuthenticated, BelongsToOrganization, IsOrganizationStaff]
+    filter_backends = []
+
+    def get_queryset(self):
+        organization = self.request.organization
+        if organization is None:
+            raise NotFound("Organization not found.")
+        params = self.request.query_params
+        events = ActivityEvent.objects.filter(organization=organization)
+
+        types = [value for value in params.get('type', '').split(',') if value]
+        if types:
+            unknown = set(types) - {choice for choice, _ in ActivityEvent.TYPE_CHOICES}
+            if unknown:
+                raise ValidationError({"type": f"Unknown event type: {', '.join(sorted(unknown))}."})
+            events = events.filter(type__in=types)
+
+        for name, lookup in (('since', 'occurred_at__gte'), ('until', 'occurred_at__lt')):
+            value = params.get(name)
+            if value:
+                parsed = parse_datetime(value)
+                if parsed is None:
+                    raise ValidationError({name: "Invalid datetime."})
+                events = events.filter(**{lookup: aware(parsed)})
+
+        return events.order_by('-occurred_at', '-id')
@@ -12,10 +12,11 @@ class WorkspaceFilter(filters.FilterSet):
         fields = ['type', 'is_available']
 
     def filter_amenities(self, queryset, name, value):
-        amenities = value.split(',')
-        for amenity in amenities:
-            queryset = queryset.filter(amenities__icontains=amenity.strip())
-        return queryset
+        # Values are validated against AMENITY_OPTIONS, so containment is exact.
+        amenities = sorted({amenity.strip() for amenity in value.split(',') if amenity.strip()})
+        if not amenities:
+            return queryset
+        return queryset.filter(amenities__contains=amenities)
 
 
 class BookingFilter(filters.FilterSet):
@@ -0,0 +1,178 @@
+"""
+Cached dashboard payloads.
+
+@dashboard_cache.cached('top-booked', ttl=60, vary_on=('window',)) on an
+APIView's get() stores the response data per organization (and per user
+with per_user=True) in the default cache.
+
+- Soft expiry: once an entry is in the last EARLY_FRACTION of its TTL, a
+  request may recompute it early, with a probability that rises as the
+  entry ages. A hot key is refreshed before it expires instead of
+  everyone missing at once.
+- Lock: only the worker that wins a cache.add() lock recomputes. The
+  others keep serving the current entry, or wait briefly for the winner
+  on a cold key.
+- Invalidation: invalidate(organization_id) bumps the organization's
+  generation, which is part of every key, so all its entries are dropped
+  at once. workspace.signals and users.signals call it on commit.
+
+stats() reports this process's hits, misses, early refreshes and
+recompute time per dashboard.
+"""
+import functools
+import hashlib
+import math
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+DEFAULT_TTL = 60
+EARLY_FRACTION = 0.2
+LOCK_TIMEOUT = 10
+WAIT_INTERVAL = 0.05
+
+
+class DashboardCache:
+    def __init__(self, cache=cache):
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    # Keys
+
+    def _generation(self, organization_id):
+        return self.cache.get_or_set(f'dash:gen:{organization_id}', 1, None)
+
+    def invalidate(self, organization_id):
+        key = f'dash:gen:{organization_id}'
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            # Not set yet, or evicted: any new value drops the old entries.
+            self.cache.set(key, int(time.time()), None)
+
+    def key(self, name, organization_id, user_id=None, params=()):
+        digest = hashlib.sha1(repr(sorted(params)).encode()).hexdigest()[:16] if params else '-'
+        return f'dash:{name}:{organization_id}:{self._generation(organization_id)}:{user_id or "-"}:{digest}'
+
+    # Stats
+
+    def _count(self, name, field, amount=1):
+        with self._lock:
+            stats = self._stats.setdefault(name, {
+                'hits': 0, 'misses': 0, 'early_refreshes': 0, 'stale_served': 0,
+                'recomputes': 0, 'recompute_seconds': 0.0,
+            })
+            stats[field] += amount
+
+    def stats(self):
+        with self._lock:
+            stats = {name: dict(values) for name, values in self._stats.items()}
+        for values in stats.values():
+            lookups = values['hits'] + values['misses']
+            values['hit_rate'] = values['hits'] / lookups if lookups else 0
+            values['avg_recompute_seconds'] = (
+                values['recompute_seconds'] / values['recomputes'] if values['recomputes'] else 0
+            )
+        return stats
+
+    # Lookup
+
+    def _should_refresh_early(self, entry, ttl):
+        remaining = entry['expires_at'] - time.time()
+        window = ttl * EARLY_FRACTION
+        if remaining > window:
+            return False
+        # Linear ramp from 0 at the start of the window to 1 at expiry.
+        return random.random() < 1 - max(remaining, 0) / window
+
+    def _recompute(self, name, key, ttl, compute):
+        started = time.perf_counter()
+        payload = compute()
+        elapsed = time.perf_counter() - started
+        self._count(name, 'recomputes')
+        self._count(name, 'recompute_seconds', elapsed)
+        # Keep entries a little past their soft TTL so waiters and the
+        # early-refresh window always have something to serve.
+        self.cache.set(key, {'payload': payload, 'expires_at': time.time() + ttl}, math.ceil(ttl * (1 + EARLY_FRACTION)))
+        return payload
+
+    def get_or_compute(self, name, key, compute, ttl=DEFAULT_TTL):
+        entry = self.cache.get(key)
+        if entry is not None and entry['expires_at'] > time.time():
+            self._count(name, 'hits')
+            if not self._should_refresh_early(entry, ttl):
+                return entry['payload']
+            self._count(name, 'early_refreshes')
+        else:
+            self._count(name, 'misses')
+
+        lock_key = f'{key}:lock'
+        if self.cache.add(lock_key, 1, LOCK_TIMEOUT):
+            try:
+                return self._recompute(name, key, ttl, compute)
+            finally:
+                self.cache.delete(lock_key)
+
+        if entry is not None:
+            # Someone else is already recomputing.
+            self._count(name, 'stale_served')
+            return entry['payload']
+
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(WAIT_INTERVAL)
+            entry = self.cache.get(key)
+            if entry is not None:
+                return entry['payload']
+            if self.cache.get(lock_key) is None:
+                break
+        return self._recompute(name, key, ttl, compute)
+
+    def cached(self, name, ttl=None, per_user=False, vary_on=()):
+        """
+        Decorate an APIView get(self, request, ...) to cache its 200
+        responses. vary_on lists the query parameters that change the
+        payload; others are ignored.
+        """
+        def decorator(get):
+            @functools.wraps(get)
+            def wrapper(view, request, *args, **kwargs):
+                organization = getattr(request, 'organization', None)
+                if organization is None:
+                    return get(view, request, *args, **kwargs)
+                params = [(param, request.query_params.get(param)) for param in vary_on]
+                key = self.key(name, organization.id, request.user.id if per_user else None, params)
+
+                computed = []
+
+                def compute():
+                    response = get(view, request, *args, **kwargs)
+                    computed.append(response)
+                    if response.status_code != 200:
+                        # Errors go back to the caller as they are, uncached.
+                        raise _Uncacheable()
+                    return response.data
+
+                try:
+                    data = self.get_or_compute(
+                        name, key, compute,
+                        ttl or getattr(settings, 'DASHBOARD_CACHE_TTL', DEFAULT_TTL),
+                    )
+                except _Uncacheable:
+                    return computed[0]
+                # A freshly computed response keeps its own headers.
+                return computed[0] if computed else Response(data)
+            return wrapper
+        return decorator
+
+
+class _Uncacheable(Exception):
+    pass
+
+
+dashboard_cache = DashboardCache()
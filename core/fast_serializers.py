@@ -0,0 +1,131 @@
+"""
+Fast read path for list endpoints.
+
+A ModelSerializer spends most of a large page on model instantiation and
+per-field get_attribute()/to_representation() dispatch. For serializers
+whose fields are plain columns or annotations, compile_plan() builds a
+plan once per (serializer class, field selection): the columns to fetch
+and, for each field, either nothing or the field's own to_representation.
+FastListMixin then renders pages from values_list() rows through that
+plan. Output is the same as serializer.data, because every field that
+changes a value still goes through its own to_representation.
+
+Serializers with method fields, dotted sources, nested serializers or
+properties fall back to the normal path.
+"""
+import threading
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.response import Response
+
+# to_representation() returns database values of these unchanged.
+PASSTHROUGH = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.JSONField,
+    serializers.ReadOnlyField,
+)
+
+_plans = {}
+_lock = threading.Lock()
+
+
+class Plan:
+    def __init__(self, names, columns, converters):
+        self.names = names
+        self.columns = columns
+        self.converters = converters
+
+    def render(self, rows):
+        """Rows are values_list() tuples starting with self.columns."""
+        fields = list(zip(self.names, self.converters))
+        return [
+            {
+                name: value if convert is None or value is None else convert(value)
+                for (name, convert), value in zip(fields, row)
+            }
+            for row in rows
+        ]
+
+
+def _converter(field):
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        # values_list() already yields the pk.
+        return field.pk_field.to_representation if field.pk_field else None
+    if isinstance(field, PASSTHROUGH) and not isinstance(field, serializers.ChoiceField):
+        return None
+    return field.to_representation
+
+
+def _build(serializer, model, annotations):
+    opts = model._meta
+    names, columns, converters = [], [], []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        source = field.source
+        if source == '*' or '.' in source or isinstance(
+            field, (serializers.BaseSerializer, serializers.SerializerMethodField, serializers.ManyRelatedField)
+        ):
+            return None
+        try:
+            model_field = opts.get_field(source)
+        except FieldDoesNotExist:
+            if source not in annotations:
+                if hasattr(model, source) or field.required:
+                    # A property or method on the model.
+                    return None
+                # Missing optional read-only values are skipped by the
+                # serializer too.
+                continue
+        else:
+            if not model_field.concrete or model_field.many_to_many:
+                return None
+        names.append(name)
+        columns.append(source)
+        converters.append(_converter(field))
+    return Plan(names, columns, converters)
+
+
+def compile_plan(serializer, queryset):
+    """Plan for `serializer` (an instance) over `queryset`, or None."""
+    annotations = frozenset(queryset.query.annotations)
+    key = (type(serializer), tuple(serializer.fields), queryset.model, annotations)
+    try:
+        return _plans[key]
+    except KeyError:
+        plan = _build(serializer, queryset.model, annotations)
+        with _lock:
+            _plans[key] = plan
+        return plan
+
+
+class FastListMixin:
+    """
+    For generic list views: render pages through compile_plan() when the
+    serializer allows it. Ordering and keyset columns are fetched too, so
+    cursors keep working, but they are not rendered.
+    """
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        plan = compile_plan(self.get_serializer(), queryset)
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        columns = list(plan.columns)
+        ordering = list(queryset.query.order_by) + list(getattr(self, 'keyset_ordering', None) or ())
+        for name in ordering + ['id']:
+            if isinstance(name, str):
+                name = name.lstrip('-')
+                if name != '?' and name not in columns:
+                    columns.append(name)
+        # Named rows, so KeysetPagination can read the cursor values.
+        rows = queryset.values_list(*columns, named=True)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(plan.render(page))
+        return Response(plan.render(rows))
@@ -0,0 +1,100 @@
+"""
+Sparse fieldsets: ?fields=id,name keeps only the listed fields and
+?omit=description,amenities drops the listed ones, on GET requests.
+
+SparseFieldsetMixin trims a serializer's fields when it is built with a
+request in its context. Nested serializers are built without one and are
+left whole. SparseQuerysetMixin goes on the view and narrows the queryset
+to the columns those fields read, with only(). The pk, the ordering
+columns and annotations are always kept. If a field reads something the
+mixin can't map to a column, such as a property, the queryset is left
+untouched.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def _names(request, param):
+    value = request.query_params.get(param, '')
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def selected_fields(request, available):
+    """The subset of `available` field names the request asks for."""
+    if request is None or request.method != 'GET':
+        return set(available)
+    selected = set(available)
+    for param in (FIELDS_PARAM, OMIT_PARAM):
+        names = _names(request, param)
+        if not names:
+            continue
+        unknown = set(names) - set(available)
+        if unknown:
+            raise ValidationError({param: f"Unknown field(s): {', '.join(sorted(unknown))}."})
+        if param == FIELDS_PARAM:
+            selected &= set(names)
+        else:
+            selected -= set(names)
+    return selected
+
+
+class SparseFieldsetMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = selected_fields(self.context.get('request'), list(self.fields))
+        for name in list(self.fields):
+            if name not in selected:
+                self.fields.pop(name)
+
+
+def columns_for(serializer, queryset):
+    """
+    Model fields `serializer` reads from `queryset` rows, or None if some
+    field's source isn't a plain column or annotation.
+    """
+    opts = queryset.model._meta
+    columns = {opts.pk.name}
+    for field in serializer.fields.values():
+        source = field.source
+        if source == '*' or '.' in source:
+            return None
+        if source in queryset.query.annotations:
+            continue
+        try:
+            model_field = opts.get_field(source)
+        except FieldDoesNotExist:
+            if hasattr(queryset.model, source) or field.required:
+                return None
+            continue  # optional and absent: the serializer skips it
+        if not model_field.concrete:
+            return None
+        columns.add(model_field.name)
+    return columns
+
+
+class SparseQuerysetMixin:
+    """
+    For generic views whose serializer uses SparseFieldsetMixin: only()
+    the columns the trimmed serializer reads.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        params = self.request.query_params
+        if self.request.method != 'GET' or not (FIELDS_PARAM in params or OMIT_PARAM in params):
+            return queryset
+
+        columns = columns_for(self.get_serializer(), queryset)
+        if columns is None:
+            return queryset
+        # Ordering and keyset cursors read these from each row.
+        ordering = list(queryset.query.order_by) + list(getattr(self, 'keyset_ordering', None) or ())
+        for name in ordering:
+            if isinstance(name, str):
+                name = name.lstrip('-')
+                if name not in queryset.query.annotations and name != '?' and '__' not in name:
+                    columns.add(name)
+        return queryset.only(*columns)
@@ -0,0 +1,245 @@
+"""
+Password hashing off the request workers.
+
+PBKDF2 hashing and verification run in a small process pool so a login
+spike can't tie up every request worker. At most MAX_PENDING jobs may be
+queued or running per process; beyond that PasswordHashingBusy (503) is
+raised instead of letting requests pile up behind the pool.
+
+Configured with settings.PASSWORD_HASH_POOL:
+
+    PASSWORD_HASH_POOL = {
+        'WORKERS': 2,        # 0 hashes inline in the request worker
+        'MAX_PENDING': 32,
+        'TIMEOUT': 10,       # seconds to wait for a result
+        'BULK_CHUNK': 8,     # passwords per bulk-import job
+        'BULK_IN_FLIGHT': 0, # bulk jobs at once; 0 is half the workers
+    }
+
+Bulk imports go through in small chunks with only a few queued at a time,
+so logins submitted meanwhile are picked up between them. Their deadline
+comes from the hash time measured on earlier chunks.
+
+Sync views call make_password()/check_password()/check_user_password();
+async views (ASGI, core.asgi) await amake_password()/acheck_password().
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+DEFAULTS = {
+    'WORKERS': min(4, os.cpu_count() or 1),
+    'MAX_PENDING': 32,
+    'TIMEOUT': 10,
+    'BULK_CHUNK': 8,
+    'BULK_IN_FLIGHT': 0,
+}
+# Seconds per hash assumed until a bulk chunk has been timed; PBKDF2 with
+# Django's default iterations takes 0.1-0.4s.
+INITIAL_HASH_SECONDS = 0.5
+# A chunk may take this many times the measured hash time before timing out.
+HASH_TIME_SLACK = 3
+
+
+class PasswordHashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many sign-in attempts right now, please retry shortly."
+    default_code = 'password_hashing_busy'
+
+
+def _init_worker(settings_module):
+    # Hashers only need settings, not the app registry.
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+
+
+def _hash(password):
+    return hashers.make_password(password)
+
+
+def _verify(password, encoded):
+    return hashers.verify_password(password, encoded)
+
+
+def _hash_many(passwords):
+    started = time.perf_counter()
+    hashed = [hashers.make_password(password) for password in passwords]
+    return hashed, time.perf_counter() - started
+
+
+class PasswordHashPool:
+    def __init__(self, workers=None, max_pending=None, timeout=None):
+        self._overrides = {'WORKERS': workers, 'MAX_PENDING': max_pending, 'TIMEOUT': timeout}
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._hash_seconds = INITIAL_HASH_SECONDS
+        self._stats = {
+            'submitted': 0,
+            'completed': 0,
+            'rejected': 0,
+            'timeouts': 0,
+            'peak_pending': 0,
+            'busy_seconds': 0.0,
+        }
+
+    def _option(self, name):
+        if self._overrides.get(name) is not None:
+            return self._overrides[name]
+        return getattr(settings, 'PASSWORD_HASH_POOL', {}).get(name, DEFAULTS[name])
+
+    @property
+    def enabled(self):
+        return self._option('WORKERS') > 0
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # spawn, not fork: forking a threaded server process is unsafe.
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self._option('WORKERS'),
+                        mp_context=multiprocessing.get_context('spawn'),
+                        initializer=_init_worker,
+                        initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'core.settings'),),
+                    )
+        return self._executor
+
+    def _submit(self, fn, *args, bulk=False):
+        with self._lock:
+            # Bulk jobs are already limited to BULK_IN_FLIGHT by the caller.
+            if not bulk and self._pending >= self._option('MAX_PENDING'):
+                self._stats['rejected'] += 1
+                raise PasswordHashingBusy()
+            self._pending += 1
+            self._stats['submitted'] += 1
+            self._stats['peak_pending'] = max(self._stats['peak_pending'], self._pending)
+
+        started = time.perf_counter()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._done(started)
+            raise
+        future.add_done_callback(lambda _: self._done(started))
+        return future
+
+    def _done(self, started):
+        with self._lock:
+            self._pending -= 1
+            self._stats['completed'] += 1
+            self._stats['busy_seconds'] += time.perf_counter() - started
+
+    def _run(self, fn, *args):
+        if not self.enabled:
+            return fn(*args)
+        future = self._submit(fn, *args)
+        try:
+            return future.result(timeout=self._option('TIMEOUT'))
+        except FutureTimeout:
+            with self._lock:
+                self._stats['timeouts'] += 1
+            raise PasswordHashingBusy()
+
+    async def _arun(self, fn, *args):
+        if not self.enabled:
+            return fn(*args)
+        future = self._submit(fn, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self._option('TIMEOUT'))
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._stats['timeouts'] += 1
+            raise PasswordHashingBusy()
+
+    def make_password(self, password):
+        if password is None:
+            # Unusable passwords aren't hashed, no need for a worker.
+            return hashers.make_password(None)
+        return self._run(_hash, password)
+
+    def make_passwords(self, passwords):
+        """Hash many passwords (bulk imports) without starving logins."""
+        passwords = list(passwords)
+        if not self.enabled or not passwords:
+            return _hash_many(passwords)[0]
+        size = self._option('BULK_CHUNK')
+        in_flight = self._option('BULK_IN_FLIGHT') or max(1, self._option('WORKERS') // 2)
+        hashed = []
+        futures = deque()
+        for start in range(0, len(passwords), size):
+            if len(futures) >= in_flight:
+                hashed.extend(self._bulk_result(*futures.popleft()))
+            chunk = passwords[start:start + size]
+            futures.append((self._submit(_hash_many, chunk, bulk=True), len(chunk)))
+        while futures:
+            hashed.extend(self._bulk_result(*futures.popleft()))
+        return hashed
+
+    def _bulk_result(self, future, count):
+        timeout = self._option('TIMEOUT') + count * self._hash_seconds * HASH_TIME_SLACK
+        try:
+            hashed, elapsed = future.result(timeout=timeout)
+        except FutureTimeout:
+            with self._lock:
+                self._stats['timeouts'] += 1
+            raise PasswordHashingBusy()
+        with self._lock:
+            # Moving average, so one slow chunk doesn't swing the deadline.
+            self._hash_seconds = 0.8 * self._hash_seconds + 0.2 * elapsed / count
+        return hashed
+
+    def check_password(self, password, encoded, setter=None):
+        is_correct, must_update = self._run(_verify, password, encoded)
+        if setter and is_correct and must_update:
+            setter(password)
+        return is_correct
+
+    async def amake_password(self, password):
+        if password is None:
+            return hashers.make_password(None)
+        return await self._arun(_hash, password)
+
+    async def acheck_password(self, password, encoded):
+        is_correct, _ = await self._arun(_verify, password, encoded)
+        return is_correct
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending'] = self._pending
+            stats['hash_seconds'] = self._hash_seconds
+        stats['workers'] = self._option('WORKERS')
+        stats['max_pending'] = self._option('MAX_PENDING')
+        stats['saturation'] = stats['pending'] / stats['max_pending'] if stats['max_pending'] else 0
+        return stats
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+password_pool = PasswordHashPool()
+
+make_password = password_pool.make_password
+check_password = password_pool.check_password
+amake_password = password_pool.amake_password
+acheck_password = password_pool.acheck_password
+
+
+def check_user_password(user, password):
+    """Pool-backed equivalent of AbstractBaseUser.check_password()."""
+    def setter(raw_password):
+        user.password = make_password(raw_password)
+        user.save(update_fields=['password'])
+    return check_password(password, user.password, setter)
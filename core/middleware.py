@@ -1,5 +1,5 @@
 from django.utils.deprecation import MiddlewareMixin
-from organizations.models import Organization
+from organizations.resolver import organization_resolver
 
 EXCLUDED_PATHS = [
     '/api/organizations/signup/',
@@ -11,11 +11,9 @@ class OrganizationMiddleware(MiddlewareMixin):
         if any(request.path.startswith(path) for path in EXCLUDED_PATHS):
             return self.get_response(request)
 
-        try:
-            org_code = request.path.strip('/').split('/')[0]
-            organization = Organization.objects.get(code=org_code)
-            request.organization = organization
-        except (IndexError, Organization.DoesNotExist):
-            request.organization = None
+        # Views read request.organization instead of looking the code up again.
+        org_code = request.path.strip('/').split('/')[0]
+        request.org_code = org_code
+        request.organization = organization_resolver.resolve(org_code)
 
         return self.get_response(request)
@@ -0,0 +1,189 @@
+"""
+Keyset (cursor) pagination.
+
+Pages are fetched with WHERE (key) > (last key seen) ORDER BY key LIMIT n
+instead of OFFSET, and no COUNT(*) is run, so page 1000 costs the same as
+page 1. The ordering must end in a unique column (normally 'id') and its
+fields must not be NULL. Cursors are opaque base64 strings.
+
+The key is the queryset's own ordering (so OrderingFilter and search
+ranking still apply) with 'id' appended as the tiebreaker; views can set
+`keyset_ordering`, e.g. ('start_time', 'id'), for unordered querysets.
+Annotated fields are allowed. Float annotations must be double precision:
+a cursor holds the value as a Python float, and comparing it with a `real`
+such as ts_rank() or similarity() is done in float8, so the row's own value
+never compares equal and ties are repeated or skipped. Wrap them in
+Cast(..., FloatField()).
+
+?include_total=approx adds an `approximate_count` taken from the planner
+(pg_class.reltuples for a whole table, the EXPLAIN row estimate for a
+filtered queryset) instead of running COUNT(*).
+"""
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Can't encode {type(value).__name__} in a cursor")
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, default=_json_default, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise NotFound("Invalid cursor")
+    if not isinstance(values, list):
+        raise NotFound("Invalid cursor")
+    return values
+
+
+def keyset_filter(ordering, values):
+    """
+    Q for rows strictly after `values` in `ordering`, expanded as
+    (a > x) OR (a = x AND b > y) OR ... so mixed directions work.
+    """
+    condition = Q()
+    equal_so_far = Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        condition |= equal_so_far & Q(**{f'{name}__{lookup}': value})
+        equal_so_far &= Q(**{name: value})
+    return condition
+
+
+def approximate_count(queryset):
+    connection = connections[queryset.db]
+    if not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 until the table has been analyzed.
+        return max(row[0], 0) if row else 0
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    if isinstance(plan, list):
+        plan = plan[0]
+    return int(plan['Plan']['Plan Rows'])
+
+
+class KeysetPagination(BasePagination):
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    ordering = ('id',)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = [field for field in queryset.query.order_by if isinstance(field, str)]
+        if not ordering or len(ordering) != len(queryset.query.order_by):
+            ordering = getattr(view, 'keyset_ordering', None) or self.ordering
+            ordering = ordering(request) if callable(ordering) else ordering
+        ordering = [field for field in ordering if field != '?']
+        if not any(field.lstrip('-') in ('id', 'pk') for field in ordering):
+            ordering.append('id')
+        return tuple(ordering)
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering_fields = self.get_ordering(request, queryset, view)
+        self.page_size_value = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering_fields)
+        self.approximate_count = None
+        if request.query_params.get('include_total') == 'approx':
+            self.approximate_count = approximate_count(queryset)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != len(self.ordering_fields):
+                raise NotFound("Invalid cursor")
+            queryset = queryset.filter(keyset_filter(self.ordering_fields, values))
+
+        # One extra row tells us whether there's a next page without a COUNT.
+        rows = list(queryset[:self.page_size_value + 1])
+        self.has_next = len(rows) > self.page_size_value
+        rows = rows[:self.page_size_value]
+        self.next_values = self._key(rows[-1]) if self.has_next else None
+        return rows
+
+    def _key(self, row):
+        values = []
+        for field in self.ordering_fields:
+            name = field.lstrip('-')
+            values.append(row[name] if isinstance(row, dict) else getattr(row, name))
+        return values
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, encode_cursor(self.next_values))
+
+    def get_paginated_response(self, data):
+        payload = {'next': self.get_next_link()}
+        if self.approximate_count is not None:
+            payload['approximate_count'] = self.approximate_count
+        payload['results'] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'approximate_count': {'type': 'integer'},
+                'results': schema,
+            },
+        }
+
+
+class KeysetPaginationMixin:
+    """
+    For generic views: use KeysetPagination when the request asks for it with
+    ?cursor= or ?pagination=cursor, and the view's page-number pagination
+    otherwise, so existing clients keep their response shape.
+    """
+    keyset_pagination_class = KeysetPagination
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            if 'cursor' in params or params.get('pagination') == 'cursor':
+                self._paginator = self.keyset_pagination_class()
+            elif self.pagination_class is None:
+                self._paginator = None
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
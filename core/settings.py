@@ -39,8 +39,12 @@ from corsheaders.defaults import default_headers
 
 CORS_ALLOW_HEADERS = list(default_headers) + [
     'Authorization',
+    'If-None-Match',
 ]
 
+# Lets the frontend read list ETags to send back for 304s.
+CORS_EXPOSE_HEADERS = ['ETag']
+
 ALLOWED_HOSTS = ['wms-back.onrender.com', 'localhost', '127.0.0.1','localhost:5173','wms-front-sable.vercel.app']
 
 AUTH_USER_MODEL = 'organizations.User'
@@ -54,6 +58,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'organizations',
     'drf_yasg',
@@ -64,11 +69,13 @@ INSTALLED_APPS = [
     'login',
     'django_filters',
     'workspace',
+    'outbox',
+    'activity',
 ]
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.TenantJWTAuthentication',
     ),
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
@@ -118,6 +125,11 @@ WSGI_APPLICATION = 'core.wsgi.application'
 
 #DATABASE_URL = config('DATABASE_URL')
 
+# Similarity cutoff for fuzzy workspace search (name % 'q', see
+# workspace.views.FuzzySearchFilter). Passed as a connection option, so it
+# costs no extra round trip per connection.
+WORKSPACE_SEARCH_THRESHOLD = config('WORKSPACE_SEARCH_THRESHOLD', default=0.2, cast=float)
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -128,10 +140,23 @@ DATABASES = {
         'PORT': config('DB_PORT'),
         'OPTIONS': {
             'sslmode': 'require',
+            'options': f'-c pg_trgm.similarity_threshold={WORKSPACE_SEARCH_THRESHOLD}',
         },
     }
 }
 
+# Shared cache for computed dashboard payloads (core.caching) and resource
+# versions (core.versioning). Local memory by default, which leaves ETags
+# off; point CACHE_BACKEND/CACHE_LOCATION at Redis or memcached so every
+# worker shares one copy, e.g.
+# django.core.cache.backends.redis.RedisCache + redis://localhost:6379/1.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', 'wms'),
+    }
+}
+
 
 
 # Password validation
@@ -0,0 +1,200 @@
+from datetime import timedelta
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.fast_serializers import compile_plan
+from organizations.models import Organization
+from users.authentication import ADMIN, CLIENT, TenantPrincipal
+from users.models import ClientUser
+from users.serializers import ClientUserSignupSerializer
+from users.views import OrganizationUsersView
+from workspace.models import Booking, Workspace
+from workspace.serializers import BookingSerializer, WorkspaceSerializer
+from workspace.views import BookingListView, WorkspaceListView, WorkspaceViewSet
+
+
+class FastListEquivalenceTests(TestCase):
+    """FastListMixin responses must match the serializer path exactly."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(organization_name="Acme", email="acme@example.com")
+        other = Organization.objects.create(organization_name="Other", email="other@example.com")
+
+        cls.member = ClientUser.objects.create(
+            organization=cls.organization, full_name="Ada Lovelace", email="ada@example.com", status='Active',
+        )
+        ClientUser.objects.create(
+            organization=cls.organization, full_name="Grace Hopper", email="grace@example.com",
+            is_staff=True, is_active=False, notifications_enabled=False,
+        )
+        ClientUser.objects.create(organization=other, full_name="Ada Other", email="ada@other.example.com")
+
+        desk = Workspace.objects.create(
+            organization=cls.organization, name="Hot Desk 1", type="Desk", capacity=1, amenities=["wifi", "monitor"],
+        )
+        room = Workspace.objects.create(
+            organization=cls.organization, name="Meeting Room Blue", type="Room", capacity=8,
+            description="A meeting room with a projector and a whiteboard", amenities=[],
+        )
+        Workspace.objects.create(
+            organization=cls.organization, name="Quiet Office", type="Office", capacity=2,
+            description=None, amenities={'wifi': True, 'floor': 3},
+        )
+        Workspace.objects.create(organization=other, name="Other Room", type="Room", capacity=4)
+
+        now = timezone.now()
+        # Occupied right now, so is_available differs between rows.
+        Booking.objects.create(
+            workspace=room, user=cls.member, status='ACTIVE',
+            start_time=now - timedelta(hours=1, microseconds=123), end_time=now + timedelta(hours=1),
+        )
+        Booking.objects.create(
+            workspace=desk, user=cls.member, status='PENDING',
+            start_time=now + timedelta(days=1), end_time=now + timedelta(days=1, hours=2, microseconds=456789),
+        )
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.admin = TenantPrincipal(
+            1, ADMIN, 'admin', self.organization.id, self.organization.code, 'admin@example.com',
+        )
+        self.client_user = TenantPrincipal(
+            self.member.id, CLIENT, 'member', self.organization.id, self.organization.code, self.member.email,
+        )
+
+    def get(self, view, principal, params):
+        request = self.factory.get('/', params)
+        # Set by OrganizationMiddleware in a real request.
+        request.organization = self.organization
+        request.org_code = self.organization.code
+        force_authenticate(request, user=principal)
+        return view(request, org_code=self.organization.code)
+
+    def assertSameAsSerializer(self, view, principal=None, **params):
+        fast = self.get(view, principal or self.admin, params)
+        with mock.patch('core.fast_serializers.compile_plan', return_value=None):
+            slow = self.get(view, principal or self.admin, params)
+        self.assertEqual(fast.status_code, 200, fast.data)
+        self.assertEqual(slow.status_code, 200, slow.data)
+        self.assertEqual(fast.data, slow.data)
+        return fast.data
+
+    def test_serializers_compile_to_plans(self):
+        cases = [
+            (WorkspaceSerializer(), Workspace.objects.with_availability()),
+            (BookingSerializer(), Booking.objects.all()),
+            (ClientUserSignupSerializer(), ClientUser.objects.all()),
+        ]
+        for serializer, queryset in cases:
+            with self.subTest(serializer=type(serializer).__name__):
+                self.assertIsNotNone(compile_plan(serializer, queryset))
+
+    def test_workspace_list(self):
+        data = self.assertSameAsSerializer(WorkspaceListView.as_view())
+        rows = data['results']
+        self.assertEqual([row['name'] for row in rows], ["Hot Desk 1", "Meeting Room Blue", "Quiet Office"])
+        self.assertEqual({row['is_available'] for row in rows}, {True, False})
+        self.assertNotIn('headline', rows[0])
+
+    def test_workspace_list_ordering_and_filters(self):
+        self.assertSameAsSerializer(WorkspaceListView.as_view(), ordering='-capacity')
+        self.assertSameAsSerializer(WorkspaceListView.as_view(), type='room', min_capacity=2)
+        self.assertSameAsSerializer(WorkspaceListView.as_view(), is_available='false')
+
+    def test_workspace_viewset_search_with_headline(self):
+        view = WorkspaceViewSet.as_view({'get': 'list'})
+        data = self.assertSameAsSerializer(view, q='projector', highlight='1')
+        self.assertEqual(len(data['results']), 1)
+        self.assertIn('headline', data['results'][0])
+        self.assertSameAsSerializer(view, search='meting rom')
+
+    def test_workspace_sparse_fieldsets(self):
+        view = WorkspaceListView.as_view()
+        data = self.assertSameAsSerializer(view, fields='id,name')
+        self.assertEqual(set(data['results'][0]), {'id', 'name'})
+        data = self.assertSameAsSerializer(view, omit='description,amenities,is_available')
+        self.assertEqual(set(data['results'][0]), {'id', 'name', 'type', 'capacity'})
+
+    def test_booking_list(self):
+        data = self.assertSameAsSerializer(BookingListView.as_view(), self.client_user)
+        row = data['results'][0]
+        # Datetimes keep their microseconds and FKs render as pks.
+        self.assertEqual(row['user'], self.member.id)
+        self.assertIsInstance(row['workspace'], int)
+        self.assertIsInstance(row['start_time'], str)
+        self.assertEqual({row['status'] for row in data['results']}, {'ACTIVE', 'PENDING'})
+
+    def test_booking_sparse_fieldsets(self):
+        view = BookingListView.as_view()
+        data = self.assertSameAsSerializer(view, self.client_user, fields='id,start_time,status')
+        self.assertEqual(set(data['results'][0]), {'id', 'start_time', 'status'})
+        self.assertSameAsSerializer(view, self.client_user, omit='workspace,user')
+
+    def test_organization_users(self):
+        view = OrganizationUsersView.as_view()
+        data = self.assertSameAsSerializer(view)
+        self.assertEqual([row['email'] for row in data['results']], ["ada@example.com", "grace@example.com"])
+        self.assertSameAsSerializer(view, search='ada')
+        data = self.assertSameAsSerializer(view, fields='email,status')
+        self.assertEqual(set(data['results'][0]), {'email', 'status'})
+
+
+class KeysetPaginationTests(TestCase):
+    """Cursors over float ranks must neither repeat nor skip tied rows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(organization_name="Acme", email="acme@example.com")
+        # Same name, so the same similarity for every row; not a round float.
+        cls.user_ids = [
+            ClientUser.objects.create(
+                organization=cls.organization, full_name="Jordan Tiebreak Smith", email=f"u{i}@example.com",
+            ).id
+            for i in range(5)
+        ]
+        cls.workspace_ids = [
+            Workspace.objects.create(
+                organization=cls.organization, name=f"Room {i}", type="Room", capacity=4,
+                description="A quiet room with a projector and a long whiteboard wall",
+            ).id
+            for i in range(5)
+        ]
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.admin = TenantPrincipal(
+            1, ADMIN, 'admin', self.organization.id, self.organization.code, 'admin@example.com',
+        )
+
+    def collect(self, view, **params):
+        params.update(pagination='cursor', page_size=2)
+        ids = []
+        for _ in range(10):
+            request = self.factory.get('/', params)
+            request.organization = self.organization
+            request.org_code = self.organization.code
+            force_authenticate(request, user=self.admin)
+            response = view(request, org_code=self.organization.code)
+            self.assertEqual(response.status_code, 200, response.data)
+            ids += [row['id'] for row in response.data['results']]
+            if response.data['next'] is None:
+                return ids
+            params['cursor'] = parse_qs(urlsplit(response.data['next']).query)['cursor'][0]
+        self.fail("Pagination didn't finish")
+
+    def test_tied_similarity(self):
+        ids = self.collect(OrganizationUsersView.as_view(), search='tieb')
+        self.assertEqual(ids, sorted(self.user_ids))
+
+    def test_tied_search_rank(self):
+        ids = self.collect(WorkspaceViewSet.as_view({'get': 'list'}), q='projector')
+        self.assertEqual(ids, sorted(self.workspace_ids))
+
+    def test_tied_fuzzy_rank(self):
+        ids = self.collect(WorkspaceViewSet.as_view({'get': 'list'}), search='room')
+        self.assertEqual(ids, sorted(self.workspace_ids))
@@ -0,0 +1,35 @@
+"""
+Per-query timings for views that run several queries.
+
+time_queries() runs {name: callable} in order on the request's connection
+and records how long each took; server_timing() turns that into a
+Server-Timing header, so slow parts of a dashboard show up in the
+browser's network panel.
+
+    results, timings = time_queries({
+        'events': lambda: list(events_queryset),
+        'counts': lambda: dict(counts_queryset),
+    })
+    response['Server-Timing'] = server_timing(timings)
+
+Each callable must fully evaluate its queryset.
+"""
+import time
+
+
+def time_queries(queries):
+    """
+    Run {name: callable} in order and return ({name: result},
+    {name: seconds}).
+    """
+    results, timings = {}, {}
+    for name, fn in queries.items():
+        started = time.perf_counter()
+        results[name] = fn()
+        timings[name] = time.perf_counter() - started
+    return results, timings
+
+
+def server_timing(timings):
+    """Server-Timing header value for a time_queries() breakdown."""
+    return ', '.join(f'{name};dur={seconds * 1000:.1f}' for name, seconds in timings.items())
@@ -7,6 +7,7 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.http import JsonResponse
 from django.urls import include
+from .views import PasswordPoolStatsView, DashboardCacheStatsView
 #rom django.urls import include
 
 
@@ -29,7 +30,10 @@ urlpatterns = [
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
     path('', lambda request: JsonResponse({'message': 'Welcome to the WMS API!'}), name='welcome'),
     path('api/organizations/', include('organizations.urls')),
+    path('api/password-pool/stats/', PasswordPoolStatsView.as_view(), name='password-pool-stats'),
+    path('api/dashboard-cache/stats/', DashboardCacheStatsView.as_view(), name='dashboard-cache-stats'),
     path('<str:org_code>/users/', include('users.urls')),
+    path('<str:org_code>/activity/', include('activity.urls')),
     #path("<str:org_code>/bookings/", include("booking.urls")),
     path('<str:org_code>/', include('login.urls')),
     path('<str:org_code>/', include('workspace.urls')),
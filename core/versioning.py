@@ -0,0 +1,132 @@
+"""
+Per-organization resource versions and ETag revalidation.
+
+Every write to a workspace, booking or client user gives its organization's
+version for that resource a new random token, after commit (see the
+signals in workspace and users). A list response's ETag hashes those
+versions together with the path and query string, and for per-user lists
+the caller too. A poll that sends it back in If-None-Match gets a 304 before
+any queryset is built. The versions come from the cache and the
+organization and principal are resolved without the database, so an
+unchanged poll runs no queries.
+
+Versions must be seen by every worker, or one worker would keep answering
+304 after another saved a change. They are only used with a shared cache
+such as Redis or memcached; with a per-process one (the default
+LocMemCache) ETags are turned off. RESOURCE_VERSIONS_SHARED overrides the
+detection either way.
+"""
+import hashlib
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+WORKSPACE = 'workspace'
+BOOKING = 'booking'
+CLIENT_USER = 'client_user'
+
+# Backends whose entries other workers can't see.
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+class ResourceVersions:
+    def __init__(self, cache=None):
+        self._cache = cache
+
+    @property
+    def cache(self):
+        return self._cache or caches[DEFAULT_CACHE_ALIAS]
+
+    @property
+    def shared(self):
+        """Whether every worker sees the same versions."""
+        shared = getattr(settings, 'RESOURCE_VERSIONS_SHARED', None)
+        if shared is None:
+            shared = not isinstance(self.cache, PROCESS_LOCAL_BACKENDS)
+        return shared
+
+    def _key(self, organization_id, resource):
+        return f'version:{organization_id}:{resource}'
+
+    def _ttl(self):
+        # No expiry by default: an evicted version just gets a fresh token.
+        return getattr(settings, 'RESOURCE_VERSION_TTL', None)
+
+    def get(self, organization_id, resources):
+        keys = {self._key(organization_id, resource): resource for resource in resources}
+        found = self.cache.get_many(list(keys))
+        versions = {}
+        for key, resource in keys.items():
+            if key in found:
+                versions[resource] = found[key]
+            else:
+                # Unknown or expired: start a fresh version. If another worker
+                # raced us here, add() keeps theirs.
+                self.cache.add(key, uuid.uuid4().hex, self._ttl())
+                versions[resource] = self.cache.get(key)
+        return versions
+
+    def bump(self, organization_id, *resources):
+        self.cache.set_many(
+            {self._key(organization_id, resource): uuid.uuid4().hex for resource in resources},
+            self._ttl(),
+        )
+
+
+resource_versions = ResourceVersions()
+
+
+def compute_etag(request, resources, per_user=False, time_bucket=None):
+    """
+    Strong ETag for the current state of `resources` in the request's
+    organization, or None when there's no organization or the versions
+    aren't shared between workers.
+    """
+    organization = getattr(request, 'organization', None)
+    if organization is None or not resource_versions.shared:
+        return None
+    versions = resource_versions.get(organization.id, resources)
+    parts = [request.path, sorted(request.query_params.lists()), sorted(versions.items())]
+    if per_user:
+        user = request.user
+        parts.append((getattr(user, 'type', None), user.id, getattr(user, 'role', None)))
+    if time_bucket:
+        # For responses that also change with the clock, e.g. is_available.
+        parts.append(int(time.time() // time_bucket))
+    return quote_etag(hashlib.sha1(repr(parts).encode()).hexdigest())
+
+
+def not_modified(request, etag):
+    if etag is None:
+        return False
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    etags = parse_etags(header)
+    return '*' in etags or etag in etags or f'W/{etag}' in etags
+
+
+class ConditionalListMixin:
+    """
+    For generic list views: answer If-None-Match with 304 while the
+    `etag_resources` of the organization are unchanged.
+    """
+    etag_resources = ()
+    etag_per_user = False
+    etag_time_bucket = None
+
+    def list(self, request, *args, **kwargs):
+        etag = compute_etag(request, self.etag_resources, self.etag_per_user, self.etag_time_bucket)
+        if not_modified(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+        response = super().list(request, *args, **kwargs)
+        if etag and response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+        return response
@@ -0,0 +1,22 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from users.permissions import IsSuperAdmin
+from .caching import dashboard_cache
+from .hashing import password_pool
+
+
+class PasswordPoolStatsView(APIView):
+    # Saturation of this worker process's password hashing pool.
+    permission_classes = [IsAuthenticated, IsSuperAdmin]
+
+    def get(self, request):
+        return Response(password_pool.stats())
+
+
+class DashboardCacheStatsView(APIView):
+    # Hit rates and recompute times of this worker process's dashboard cache.
+    permission_classes = [IsAuthenticated, IsSuperAdmin]
+
+    def get(self, request):
+        return Response(dashboard_cache.stats())
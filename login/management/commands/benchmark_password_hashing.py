@@ -0,0 +1,36 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import hashers
+from django.core.management.base import BaseCommand
+
+from core.hashing import PasswordHashPool
+
+
+class Command(BaseCommand):
+    help = "Compare password verification throughput inline vs. through core.hashing's process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help="Verifications per run.")
+        parser.add_argument('--threads', type=int, default=8, help="Concurrent request workers to simulate.")
+        parser.add_argument('--workers', type=int, default=4, help="Processes in the hashing pool.")
+
+    def handle(self, *args, **options):
+        total, threads = options['requests'], options['threads']
+        encoded = hashers.make_password('benchmark-password')
+
+        inline = PasswordHashPool(workers=0)
+        pooled = PasswordHashPool(workers=options['workers'], max_pending=total, timeout=600)
+        # Start the worker processes outside the timed run.
+        pooled.check_password('warm-up', encoded)
+
+        for label, pool in (('inline', inline), (f"pool({options['workers']})", pooled)):
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                list(executor.map(lambda _: pool.check_password('benchmark-password', encoded), range(total)))
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"{label:>10}: {total / elapsed:8.1f} verifications/s ({elapsed:.2f}s, {threads} threads)")
+
+        stats = pooled.stats()
+        pooled.shutdown()
+        self.stdout.write(f"pool peak pending: {stats['peak_pending']}/{stats['max_pending']}, rejected: {stats['rejected']}")
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from django.contrib.auth.hashers import check_password
+from core.hashing import check_user_password
 from users.models import ClientUser
 from organizations.models import Organization, User
 
@@ -17,9 +17,7 @@ class LoginSerializer(serializers.Serializer):
         except ClientUser.DoesNotExist:
             raise serializers.ValidationError("user does not exist")
 
-        if not user.check_password(password):
-            print(user.password)
-            print(check_password(password, user.password))
+        if not check_user_password(user, password):
             raise serializers.ValidationError("Invalid email or password")
 
         data["user"] = user
@@ -32,11 +30,8 @@ class AdminLoginSerializer(serializers.Serializer):
     def validate(self, data):
         email = data.get("email")
         password = data.get("password")
-        org_code = self.context.get("org_code")
-
-        try:
-            organization = Organization.objects.get(code=org_code)
-        except Organization.DoesNotExist:
+        organization = self.context.get("organization")
+        if organization is None:
             raise serializers.ValidationError("Organization not found")
 
         try:
@@ -44,7 +39,7 @@ class AdminLoginSerializer(serializers.Serializer):
         except User.DoesNotExist:
             raise serializers.ValidationError("Admin account does not exist")
 
-        if not user.check_password(password):
+        if not check_user_password(user, password):
             raise serializers.ValidationError("Invalid email or password")
         if not user.is_active:
             raise serializers.ValidationError("Account is not active")
@@ -53,6 +48,12 @@ class AdminLoginSerializer(serializers.Serializer):
         return data
 
 
+class CredentialsSerializer(serializers.Serializer):
+    # Input only; CombinedLoginView resolves the account in login.credentials.
+    email = serializers.EmailField()
+    password = serializers.CharField(write_only=True)
+
+
 '''from rest_framework import serializers
 from django.contrib.auth.hashers import check_password
 from users.models import ClientUser
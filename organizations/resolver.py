@@ -0,0 +1,140 @@
+"""
+Process-wide organization lookup by code.
+
+OrganizationMiddleware resolves every request through here, so the
+Organization row is fetched at most once per ORGANIZATION_CACHE_TTL seconds
+per process. Unknown codes (including '/admin', '/swagger', ...) are cached
+as misses for ORGANIZATION_NEGATIVE_CACHE_TTL seconds, in a separate,
+smaller LRU (ORGANIZATION_NEGATIVE_CACHE_SIZE) so requests for made-up codes
+can't evict real organizations.
+
+The Organization save/delete signals drop entries in this process and, after
+commit, move a generation key in the shared cache; other workers compare it
+on every lookup and start over once it moves. Without a shared cache (see
+core.versioning) they can't be told, so entries only live 10 seconds by
+default instead of 300.
+"""
+import copy
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+
+from core.versioning import resource_versions
+from .models import Organization
+
+DEFAULT_MAXSIZE = 1024
+DEFAULT_TTL = 300
+DEFAULT_UNSHARED_TTL = 10
+GENERATION_KEY = 'organizations:resolver:generation'
+DEFAULT_NEGATIVE_MAXSIZE = 256
+DEFAULT_NEGATIVE_TTL = 10
+
+_MISSING = object()
+
+
+class OrganizationResolver:
+    def __init__(self, maxsize=None, ttl=None, negative_ttl=None, negative_maxsize=None):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._negative_maxsize = negative_maxsize
+        self._entries = OrderedDict()
+        self._misses = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def maxsize(self):
+        return self._maxsize or getattr(settings, 'ORGANIZATION_CACHE_SIZE', DEFAULT_MAXSIZE)
+
+    @property
+    def ttl(self):
+        default = DEFAULT_TTL if resource_versions.shared else DEFAULT_UNSHARED_TTL
+        return self._ttl or getattr(settings, 'ORGANIZATION_CACHE_TTL', default)
+
+    @property
+    def negative_maxsize(self):
+        return self._negative_maxsize or getattr(settings, 'ORGANIZATION_NEGATIVE_CACHE_SIZE', DEFAULT_NEGATIVE_MAXSIZE)
+
+    @property
+    def negative_ttl(self):
+        return self._negative_ttl or getattr(settings, 'ORGANIZATION_NEGATIVE_CACHE_TTL', DEFAULT_NEGATIVE_TTL)
+
+    def _generation(self):
+        """The shared generation, or None without a shared cache."""
+        if not resource_versions.shared:
+            return None
+        cache = resource_versions.cache
+        generation = cache.get(GENERATION_KEY)
+        if generation is None:
+            cache.add(GENERATION_KEY, uuid.uuid4().hex, None)
+            generation = cache.get(GENERATION_KEY)
+        return generation
+
+    def _get(self, code, generation):
+        with self._lock:
+            for entries in (self._entries, self._misses):
+                entry = entries.get(code)
+                if entry is None:
+                    continue
+                organization, expires_at, cached_generation = entry
+                if time.monotonic() >= expires_at or cached_generation != generation:
+                    del entries[code]
+                    return _MISSING
+                entries.move_to_end(code)
+                return organization
+            return _MISSING
+
+    def _set(self, code, organization, generation):
+        if organization is not None:
+            entries, ttl, maxsize = self._entries, self.ttl, self.maxsize
+        else:
+            entries, ttl, maxsize = self._misses, self.negative_ttl, self.negative_maxsize
+        with self._lock:
+            entries[code] = (organization, time.monotonic() + ttl, generation)
+            entries.move_to_end(code)
+            while len(entries) > maxsize:
+                entries.popitem(last=False)
+
+    def resolve(self, code):
+        """Return the Organization for `code`, or None if there isn't one."""
+        if not code:
+            return None
+        # Read before the row, so a change committed in between leaves the
+        # entry behind and the next lookup refetches it.
+        generation = self._generation()
+        organization = self._get(code, generation)
+        if organization is _MISSING:
+            organization = Organization.objects.filter(code=code).first()
+            self._set(code, organization, generation)
+        # Hand out copies so a view mutating its instance can't leak into
+        # other requests.
+        return copy.copy(organization) if organization is not None else None
+
+    def invalidate(self, organization, shared=True):
+        """
+        Drop `organization` here and, with `shared`, in every worker that
+        shares the cache. Call it with shared=True after commit, so no
+        worker can cache the old row again under the new generation.
+        """
+        if shared and resource_versions.shared:
+            resource_versions.cache.set(GENERATION_KEY, uuid.uuid4().hex, None)
+        with self._lock:
+            self._entries.pop(organization.code, None)
+            self._misses.pop(organization.code, None)
+            stale = [
+                code for code, (cached, _, _) in self._entries.items()
+                if cached is not None and cached.pk == organization.pk
+            ]
+            for code in stale:
+                del self._entries[code]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._misses.clear()
+
+
+organization_resolver = OrganizationResolver()
@@ -0,0 +1,12 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Organization
+from .resolver import organization_resolver
+
+@receiver(post_save, sender=Organization)
+@receiver(post_delete, sender=Organization)
+def invalidate_cached_organization(sender, instance, **kwargs):
+    # Now for this process, and for every worker once the change is visible.
+    organization_resolver.invalidate(instance, shared=False)
+    transaction.on_commit(lambda: organization_resolver.invalidate(instance))
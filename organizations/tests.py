@@ -1,3 +1,33 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+from .models import Organization
+from .resolver import OrganizationResolver
+
+
+class OrganizationResolverTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organization = Organization.objects.create(organization_name="Acme", email="acme@example.com")
+
+    @override_settings(RESOURCE_VERSIONS_SHARED=True)
+    def test_invalidation_reaches_other_workers(self):
+        # Two resolvers stand in for two worker processes sharing the cache.
+        here, elsewhere = OrganizationResolver(), OrganizationResolver()
+        self.assertEqual(elsewhere.resolve(self.organization.code).organization_name, "Acme")
+
+        Organization.objects.filter(pk=self.organization.pk).update(organization_name="Renamed")
+        with self.assertNumQueries(0):
+            self.assertEqual(elsewhere.resolve(self.organization.code).organization_name, "Acme")
+        here.invalidate(self.organization)
+
+        self.assertEqual(elsewhere.resolve(self.organization.code).organization_name, "Renamed")
+
+    def test_unknown_codes_are_cached_apart(self):
+        resolver = OrganizationResolver(maxsize=1, negative_maxsize=1)
+        resolver.resolve(self.organization.code)
+        for code in ('nope1', 'nope2'):
+            self.assertIsNone(resolver.resolve(code))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(resolver.resolve(self.organization.code).pk, self.organization.pk)
@@ -6,16 +6,19 @@ from django.shortcuts import get_object_or_404
 from .models import User, Organization, ActivationToken
 from .serializers import OrganizationSignupSerializer
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
+from django.db import transaction
+from outbox.mail import enqueue_mail
 import secrets
 from django.conf import settings
 from rest_framework.permissions import AllowAny
 from django.core.cache import cache
+from core.hashing import make_password
 
 User = get_user_model()
 
 
 class OrganizationSignupView(APIView):
+    @transaction.atomic
     def post(self, request):
         org_serializer = OrganizationSignupSerializer(data=request.data)
         if org_serializer.is_valid():
@@ -25,14 +28,15 @@ class OrganizationSignupView(APIView):
             plain_password = secrets.token_urlsafe(10)
 
             # Create inactive user
-            super_admin = User.objects.create_user(
+            super_admin = User(
                 username=f"{organization.code}_admin",
-                email=organization.email,
-                password=plain_password,  # This gets hashed by Django
+                email=User.objects.normalize_email(organization.email),
+                password=make_password(plain_password),  # Hashed in core.hashing's worker pool
                 organization=organization,
                 is_super_admin=True,
                 is_active=False
             )
+            super_admin.save()
 
             # Generate activation token
             token = ActivationToken.objects.create(user=super_admin, password=plain_password)
@@ -40,12 +44,11 @@ class OrganizationSignupView(APIView):
             # Send activation link
             activation_link = f"{settings.FRONTEND_URL}activate/{token.token}"
             print(f"Activation link: {activation_link}")  # For debugging
-            send_mail(
+            enqueue_mail(
                 subject='Activate Your Organization',
                 message=f'Click to activate: {activation_link}\nNote: Link expires in 15 minutes.',
                 from_email=settings.EMAIL_HOST_USER,
                 recipient_list=[organization.email],
-                fail_silently=False,
             )
 
 
@@ -57,6 +60,7 @@ class OrganizationSignupView(APIView):
 class ResendActivationTokenView(APIView):
     permission_classes = [AllowAny]
 
+    @transaction.atomic
     def post(self, request):
         email = request.data.get('email')
         try:
@@ -78,7 +82,7 @@ class ResendActivationTokenView(APIView):
 
             # Send new activation link
             activation_link = f"{settings.FRONTEND_URL}activate/{new_token.token}"
-            send_mail(
+            enqueue_mail(
                 subject='Resend: Activate Your Organization',
                 message=f'Click to activate: {activation_link}\nNote: Link expires in 15 minutes.',
                 from_email=settings.EMAIL_HOST_USER,
@@ -93,6 +97,7 @@ class ResendActivationTokenView(APIView):
             return Response({'detail': 'Super admin not found.'}, status=404)
 
 class ActivateOrganizationView(APIView):
+    @transaction.atomic
     def get(self, request, token):
         activation_token = get_object_or_404(ActivationToken, token=token)
         user = activation_token.user
@@ -118,7 +123,7 @@ class ActivateOrganizationView(APIView):
             return Response({'detail': 'Password not found in activation token.'}, status=400)
         if plain_password:
             # Send login credentials
-            send_mail(
+            enqueue_mail(
                 subject='Your Organization Login Credentials',
                 message=f'Login Email: {user.email}\nPassword: {plain_password}\nURL: {settings.FRONTEND_URL}{organization.code}/login',
                 from_email='noreply@example.com',
@@ -0,0 +1,119 @@
+"""
+Transactional email outbox.
+
+enqueue_mail()/enqueue_mass_mail() mirror send_mail()/send_mass_mail() but
+only write OutboxEmail rows, so the email commits or rolls back with the
+request's transaction and the request never waits on SMTP. The
+send_outbox management command drains the table with send_pending().
+
+Bodies can hold credentials, so a sent email's body is blanked and
+purge_outbox() (the purge_outbox command) deletes sent and failed rows
+after OUTBOX_RETENTION_DAYS.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+BACKOFF_BASE = 30  # seconds, doubled per failed attempt
+BACKOFF_MAX = 60 * 60
+DEFAULT_RETENTION_DAYS = 7
+
+
+def enqueue_mail(subject, message, from_email, recipient_list):
+    return OutboxEmail.objects.create(
+        subject=subject,
+        message=message,
+        from_email=from_email or '',
+        recipients=list(recipient_list),
+    )
+
+
+def enqueue_mass_mail(datatuple):
+    """datatuple: (subject, message, from_email, recipient_list) tuples, like send_mass_mail()."""
+    return OutboxEmail.objects.bulk_create([
+        OutboxEmail(subject=subject, message=message, from_email=from_email or '', recipients=list(recipients))
+        for subject, message, from_email, recipients in datatuple
+    ])
+
+
+def purge_outbox():
+    """Delete sent and failed emails older than the retention period."""
+    days = getattr(settings, 'OUTBOX_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+    return OutboxEmail.objects.filter(
+        status__in=['SENT', 'FAILED'],
+        created_at__lt=timezone.now() - timedelta(days=days),
+    ).delete()[0]
+
+
+def backoff(attempts):
+    return timedelta(seconds=min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX))
+
+
+def send_pending(batch_size=50, max_attempts=5, connection=None):
+    """
+    Send one batch of due emails over a single SMTP connection.
+    Returns (sent, failed) counts for the batch.
+    """
+    sent = failed = 0
+    with transaction.atomic():
+        # skip_locked lets several workers drain the outbox side by side.
+        batch = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(status='PENDING', available_at__lte=timezone.now())
+            .order_by('available_at', 'id')[:batch_size]
+        )
+        if not batch:
+            return sent, failed
+
+        connection = connection or get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as exc:
+            logger.warning("Outbox could not connect to the mail server: %s", exc)
+            for email in batch:
+                _record_failure(email, exc, max_attempts)
+            return sent, len(batch)
+
+        try:
+            for email in batch:
+                message = EmailMessage(
+                    subject=email.subject,
+                    body=email.message,
+                    from_email=email.from_email or settings.DEFAULT_FROM_EMAIL,
+                    to=email.recipients,
+                    connection=connection,
+                )
+                try:
+                    message.send()
+                except Exception as exc:
+                    logger.warning("Outbox email %s failed: %s", email.pk, exc)
+                    _record_failure(email, exc, max_attempts)
+                    failed += 1
+                else:
+                    email.status = 'SENT'
+                    email.attempts += 1
+                    email.sent_at = timezone.now()
+                    email.message = ''
+                    email.save(update_fields=['status', 'attempts', 'sent_at', 'message'])
+                    sent += 1
+        finally:
+            connection.close()
+    return sent, failed
+
+
+def _record_failure(email, exc, max_attempts):
+    email.attempts += 1
+    email.last_error = str(exc)
+    if email.attempts >= max_attempts:
+        email.status = 'FAILED'
+    else:
+        email.available_at = timezone.now() + backoff(email.attempts)
+    email.save(update_fields=['attempts', 'last_error', 'status', 'available_at'])
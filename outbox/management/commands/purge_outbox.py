@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from outbox.mail import purge_outbox
+
+
+class Command(BaseCommand):
+    help = "Delete sent and failed outbox emails older than OUTBOX_RETENTION_DAYS."
+
+    def handle(self, *args, **options):
+        deleted = purge_outbox()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} outbox emails"))
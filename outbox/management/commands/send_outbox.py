@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from outbox.mail import send_pending
+
+
+class Command(BaseCommand):
+    help = "Send queued outbox emails in batches over a reused SMTP connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--max-attempts', type=int, default=5)
+        parser.add_argument('--loop', action='store_true', help="Keep polling instead of exiting once the outbox is empty.")
+        parser.add_argument('--interval', type=float, default=5, help="Seconds to sleep between polls with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = send_pending(options['batch_size'], options['max_attempts'])
+            if sent or failed:
+                # Keep draining while there's work.
+                self.stdout.write(f"Sent {sent}, failed {failed}")
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,173 @@
+import threading
+from datetime import timedelta
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from .mail import backoff, enqueue_mail, enqueue_mass_mail, purge_outbox, send_pending
+from .models import OutboxEmail
+
+
+class FailingBackend(EmailBackend):
+    def send_messages(self, messages):
+        raise ConnectionError("mailbox unavailable")
+
+
+class UnreachableBackend(EmailBackend):
+    def open(self):
+        raise ConnectionError("connection refused")
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class EnqueueTests(TestCase):
+    def test_enqueue_only_writes_a_row(self):
+        email = enqueue_mail("Welcome", "Hello", None, ['a@example.com'])
+
+        self.assertEqual(email.status, 'PENDING')
+        self.assertEqual(email.from_email, '')
+        self.assertEqual(email.recipients, ['a@example.com'])
+        self.assertEqual(mail.outbox, [])
+
+    def test_enqueue_mass_mail(self):
+        enqueue_mass_mail([
+            ("One", "Body 1", 'from@example.com', ['a@example.com']),
+            ("Two", "Body 2", None, ['b@example.com', 'c@example.com']),
+        ])
+
+        self.assertEqual(
+            list(OutboxEmail.objects.order_by('id').values_list('subject', 'recipients')),
+            [("One", ['a@example.com']), ("Two", ['b@example.com', 'c@example.com'])],
+        )
+
+    def test_enqueue_rolls_back_with_the_transaction(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                enqueue_mail("Welcome", "Hello", None, ['a@example.com'])
+                raise RuntimeError
+
+        self.assertFalse(OutboxEmail.objects.exists())
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend', DEFAULT_FROM_EMAIL='noreply@example.com')
+class SendPendingTests(TestCase):
+    def test_sends_due_emails_and_blanks_the_body(self):
+        email = enqueue_mail("Your password", "secret-password", None, ['a@example.com'])
+
+        self.assertEqual(send_pending(), (1, 0))
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].body, "secret-password")
+        self.assertEqual(mail.outbox[0].from_email, 'noreply@example.com')
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'SENT')
+        self.assertEqual(email.attempts, 1)
+        self.assertIsNotNone(email.sent_at)
+        self.assertEqual(email.message, '')
+
+    def test_skips_emails_that_are_not_due(self):
+        OutboxEmail.objects.create(
+            subject="Later", message="Body", recipients=['a@example.com'],
+            available_at=timezone.now() + timedelta(minutes=5),
+        )
+
+        self.assertEqual(send_pending(), (0, 0))
+        self.assertEqual(mail.outbox, [])
+
+    def test_respects_batch_size(self):
+        for i in range(3):
+            enqueue_mail(f"Email {i}", "Body", None, ['a@example.com'])
+
+        self.assertEqual(send_pending(batch_size=2), (2, 0))
+        self.assertEqual(OutboxEmail.objects.filter(status='PENDING').count(), 1)
+
+    def test_failed_send_is_retried_with_backoff(self):
+        email = enqueue_mail("Welcome", "Hello", None, ['a@example.com'])
+        before = timezone.now()
+
+        self.assertEqual(send_pending(connection=FailingBackend()), (0, 1))
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'PENDING')
+        self.assertEqual(email.attempts, 1)
+        self.assertIn("mailbox unavailable", email.last_error)
+        self.assertGreaterEqual(email.available_at, before + backoff(1))
+        self.assertEqual(email.message, "Hello")
+        # Not due again until the backoff has passed.
+        self.assertEqual(send_pending(), (0, 0))
+
+    def test_gives_up_after_max_attempts(self):
+        email = enqueue_mail("Welcome", "Hello", None, ['a@example.com'])
+        email.attempts = 2
+        email.save()
+
+        send_pending(max_attempts=3, connection=FailingBackend())
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'FAILED')
+        self.assertEqual(email.attempts, 3)
+
+    def test_connection_failure_fails_the_whole_batch(self):
+        enqueue_mail("One", "Body", None, ['a@example.com'])
+        enqueue_mail("Two", "Body", None, ['b@example.com'])
+
+        self.assertEqual(send_pending(connection=UnreachableBackend()), (0, 2))
+        self.assertEqual(set(OutboxEmail.objects.values_list('attempts', flat=True)), {1})
+
+    def test_backoff_doubles_up_to_the_cap(self):
+        self.assertEqual(backoff(1), timedelta(seconds=30))
+        self.assertEqual(backoff(2), timedelta(seconds=60))
+        self.assertEqual(backoff(20), timedelta(hours=1))
+
+
+@override_settings(OUTBOX_RETENTION_DAYS=7)
+class PurgeOutboxTests(TestCase):
+    def test_deletes_old_sent_and_failed_emails_only(self):
+        old = timezone.now() - timedelta(days=8)
+        keep = [
+            OutboxEmail.objects.create(subject="Pending", message="Body", status='PENDING'),
+            OutboxEmail.objects.create(subject="Recent", message="", status='SENT'),
+        ]
+        for status in ('SENT', 'FAILED', 'PENDING'):
+            email = OutboxEmail.objects.create(subject=status, message="Body", status=status)
+            # created_at is auto_now_add, so backdate it with update().
+            OutboxEmail.objects.filter(pk=email.pk).update(created_at=old)
+
+        self.assertEqual(purge_outbox(), 2)
+        self.assertEqual(
+            set(OutboxEmail.objects.values_list('subject', flat=True)),
+            {email.subject for email in keep} | {'PENDING'},
+        )
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class SkipLockedTests(TransactionTestCase):
+    def test_rows_locked_by_another_worker_are_skipped(self):
+        locked = enqueue_mail("Locked", "Body", None, ['a@example.com'])
+        free = enqueue_mail("Free", "Body", None, ['b@example.com'])
+        acquired = threading.Event()
+        release = threading.Event()
+
+        def hold_lock():
+            try:
+                with transaction.atomic():
+                    OutboxEmail.objects.select_for_update().get(pk=locked.pk)
+                    acquired.set()
+                    release.wait(10)
+            finally:
+                connection.close()
+
+        worker = threading.Thread(target=hold_lock)
+        worker.start()
+        try:
+            self.assertTrue(acquired.wait(10))
+            self.assertEqual(send_pending(), (1, 0))
+        finally:
+            release.set()
+            worker.join()
+
+        self.assertEqual([message.subject for message in mail.outbox], ["Free"])
+        self.assertEqual(OutboxEmail.objects.get(pk=free.pk).status, 'SENT')
+        self.assertEqual(OutboxEmail.objects.get(pk=locked.pk).status, 'PENDING')
@@ -0,0 +1,195 @@
+"""
+Stateless JWT authentication for tenant users.
+
+Tokens issued by users.utils carry the user's type, role and organization,
+so TenantJWTAuthentication can build a TenantPrincipal straight from the
+verified claims without loading the user or organization rows. Views that
+need the full model instance call principal.get_user(), which is cached per
+process for AUTH_USER_CACHE_TTL seconds and dropped on user save/delete.
+
+Writes (anything but GET/HEAD/OPTIONS) also check the cached user row, so
+a deactivated or deleted user can't change anything once the cache entry
+is gone: at once in the worker that made the change, within
+AUTH_USER_CACHE_TTL seconds elsewhere. Reads keep working until the access
+token expires (SIMPLE_JWT['ACCESS_TOKEN_LIFETIME']).
+
+What a role may do beyond its own rows is listed in ROLE_PERMISSIONS and
+checked with principal.has_perm(), rather than derived from is_staff.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from organizations.models import User
+from organizations.resolver import organization_resolver
+from .models import ClientUser
+
+CLIENT = 'client'
+ADMIN = 'admin'
+
+STAFF_ROLES = ('staff', 'admin', 'super_admin')
+
+# Read, update and delete every booking in the organization, not just the
+# principal's own. Client staff had this before tokens carried roles;
+# organization admins never did.
+MANAGE_BOOKINGS = 'workspace.manage_bookings'
+
+ROLE_PERMISSIONS = {
+    'staff': {MANAGE_BOOKINGS},
+}
+
+DEFAULT_USER_CACHE_TTL = 30
+USER_CACHE_MAXSIZE = 10000
+
+
+def user_model_for(user_type):
+    return ClientUser if user_type == CLIENT else User
+
+
+class UserCache:
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'AUTH_USER_CACHE_TTL', DEFAULT_USER_CACHE_TTL)
+
+    def get(self, user_type, user_id):
+        key = (user_type, user_id)
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() < entry[1]:
+            return entry[0]
+
+        user = user_model_for(user_type).objects.filter(pk=user_id).first()
+        if user is not None:
+            now = time.monotonic()
+            with self._lock:
+                if len(self._entries) >= USER_CACHE_MAXSIZE:
+                    self._entries = {k: v for k, v in self._entries.items() if v[1] > now}
+                    if len(self._entries) >= USER_CACHE_MAXSIZE:
+                        self._entries.clear()
+                self._entries[key] = (user, now + self.ttl)
+        return user
+
+    def invalidate(self, user_type, user_id):
+        with self._lock:
+            self._entries.pop((user_type, user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+class TenantPrincipal:
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+
+    def __init__(self, user_id, user_type, role, organization_id, org_code, email=None):
+        self.id = self.pk = user_id
+        self.type = user_type
+        self.role = role
+        self.organization_id = organization_id
+        self.org_code = org_code
+        self.email = email
+
+    def __str__(self):
+        return f"{self.email} ({self.type})"
+
+    @property
+    def is_client(self):
+        return self.type == CLIENT
+
+    @property
+    def is_admin(self):
+        return self.type == ADMIN
+
+    @property
+    def is_staff(self):
+        return self.role in STAFF_ROLES
+
+    @property
+    def is_super_admin(self):
+        return self.role == 'super_admin'
+
+    def has_perm(self, perm):
+        return perm in ROLE_PERMISSIONS.get(self.role, ())
+
+    @property
+    def organization(self):
+        return organization_resolver.resolve(self.org_code)
+
+    def belongs_to(self, organization):
+        return organization is not None and organization.pk == self.organization_id
+
+    def get_user(self):
+        """Return the full ClientUser/User row (cached)."""
+        user = user_cache.get(self.type, self.id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        return user
+
+
+def principal_for_user(user):
+    organization = user.organization
+    if isinstance(user, ClientUser):
+        user_type, role = CLIENT, 'staff' if user.is_staff else 'member'
+    else:
+        user_type, role = ADMIN, 'super_admin' if user.is_super_admin else 'admin'
+    return TenantPrincipal(
+        user_id=user.pk,
+        user_type=user_type,
+        role=role,
+        organization_id=organization.pk if organization else None,
+        org_code=organization.code if organization else None,
+        email=user.email,
+    )
+
+
+def check_active(principal):
+    """Raise AuthenticationFailed if the principal's user is gone or inactive."""
+    user = principal.get_user()
+    if not user.is_active:
+        raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+
+class TenantJWTAuthentication(JWTAuthentication):
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None and request.method not in SAFE_METHODS:
+            check_active(result[0])
+        return result
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token['user_id']
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user_type = validated_token.get('type', ADMIN)
+        if 'org_id' in validated_token:
+            return TenantPrincipal(
+                user_id=user_id,
+                user_type=user_type,
+                role=validated_token.get('role'),
+                organization_id=validated_token['org_id'],
+                org_code=validated_token.get('org_code'),
+                email=validated_token.get('email'),
+            )
+
+        # Tokens issued before the tenant claims existed: load the row once.
+        user = user_cache.get(user_type, user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return principal_for_user(user)
@@ -0,0 +1,156 @@
+"""
+Bulk client user import, shared by ClientUserImportView and the
+import_client_users management command.
+
+Rows are validated up front, checked against existing emails with a single
+query, hashed across core.hashing's process pool and inserted with
+bulk_create in chunks. An email registered in between (a signup during the
+import) is reported on its row and the rest of the chunk is inserted.
+Credential emails are queued in the outbox as one batch. Invalid rows are
+reported with their row number rather than failing the whole import.
+
+Hashing costs a few hundred milliseconds per password, so the HTTP view
+accepts at most IMPORT_MAX_HTTP_ROWS rows (200 by default); larger files go
+through the management command.
+"""
+import csv
+import io
+import json
+import secrets
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from activity.events import record_users_joined
+from core.caching import dashboard_cache
+from core.hashing import password_pool
+from core.versioning import CLIENT_USER, resource_versions
+from outbox.mail import enqueue_mass_mail
+from workspace.autocomplete import autocomplete_index
+from .models import ClientUser
+from .utils import credentials_email
+
+CHUNK_SIZE = 500
+DEFAULT_MAX_HTTP_ROWS = 200
+
+
+class ClientUserImportRowSerializer(serializers.Serializer):
+    full_name = serializers.CharField(max_length=255)
+    email = serializers.EmailField()
+    is_staff = serializers.BooleanField(required=False, default=False)
+
+
+def max_http_rows():
+    return getattr(settings, 'IMPORT_MAX_HTTP_ROWS', DEFAULT_MAX_HTTP_ROWS)
+
+
+def parse_rows(content, fmt):
+    """Turn CSV (header row: full_name,email[,is_staff]) or a JSON list into dicts."""
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig')
+    if fmt == 'json':
+        rows = json.loads(content)
+        if isinstance(rows, dict):
+            rows = rows.get('users', [])
+        if not isinstance(rows, list):
+            raise ValueError("Expected a JSON list of users.")
+        return rows
+    if fmt == 'csv':
+        # Blank cells mean "use the default", not an empty value.
+        return [
+            {(key or '').strip(): value.strip() for key, value in row.items() if isinstance(value, str) and value.strip()}
+            for row in csv.DictReader(io.StringIO(content))
+        ]
+    raise ValueError(f"Unsupported format: {fmt}")
+
+
+def import_client_users(organization, rows, activate=True, send_credentials=True, chunk_size=CHUNK_SIZE):
+    """
+    Create ClientUsers for `rows` in `organization`.
+    Returns {'created': int, 'errors': [{'row': n, 'email': ..., 'errors': ...}]}
+    with 1-based row numbers.
+    """
+    errors = []
+    valid = []
+    seen = set()
+    for number, row in enumerate(rows, start=1):
+        serializer = ClientUserImportRowSerializer(data=row)
+        if not serializer.is_valid():
+            errors.append({'row': number, 'email': row.get('email') if isinstance(row, dict) else None,
+                           'errors': serializer.errors})
+            continue
+        data = serializer.validated_data
+        data['email'] = ClientUser.objects.normalize_email(data['email'])
+        if data['email'] in seen:
+            errors.append({'row': number, 'email': data['email'], 'errors': ["Duplicate email in this import."]})
+            continue
+        seen.add(data['email'])
+        valid.append((number, data))
+
+    # ClientUser.email is unique across organizations, so check globally.
+    existing = set(
+        ClientUser.objects.filter(email__in=seen).values_list('email', flat=True)
+    )
+    new_rows = []
+    for number, data in valid:
+        if data['email'] in existing:
+            errors.append({'row': number, 'email': data['email'], 'errors': ["Email is already registered."]})
+        else:
+            new_rows.append((number, data))
+
+    passwords = [secrets.token_urlsafe(10) for _ in new_rows]
+    hashed = password_pool.make_passwords(passwords)
+
+    users = [
+        ClientUser(
+            organization=organization,
+            full_name=data['full_name'],
+            email=data['email'],
+            is_staff=data['is_staff'],
+            password=encoded,
+            is_active=activate,
+            status='Active' if activate else 'Pending',
+        )
+        for (_, data), encoded in zip(new_rows, hashed)
+    ]
+    rows_by_email = {data['email']: number for number, data in new_rows}
+    passwords_by_email = {data['email']: password for (_, data), password in zip(new_rows, passwords)}
+
+    with transaction.atomic():
+        created = []
+        for start in range(0, len(users), chunk_size):
+            created.extend(_create_chunk(users[start:start + chunk_size], rows_by_email, errors))
+        errors.sort(key=lambda error: error['row'])
+        # bulk_create skips post_save, so log the joins here.
+        record_users_joined(created)
+        transaction.on_commit(lambda: dashboard_cache.invalidate(organization.id))
+        transaction.on_commit(lambda: resource_versions.bump(organization.id, CLIENT_USER))
+        transaction.on_commit(lambda: autocomplete_index.invalidate(organization.id))
+        if send_credentials:
+            enqueue_mass_mail(
+                credentials_email(user, passwords_by_email[user.email], organization)
+                for user in created
+            )
+
+    return {'created': len(created), 'errors': errors}
+
+
+def _create_chunk(users, rows_by_email, errors):
+    """
+    bulk_create `users`. If some email was registered since the up-front
+    check, report those rows in `errors` and insert the others.
+    """
+    try:
+        with transaction.atomic():
+            return ClientUser.objects.bulk_create(users)
+    except IntegrityError:
+        taken = set(
+            ClientUser.objects.filter(email__in=[user.email for user in users]).values_list('email', flat=True)
+        )
+        if not taken:
+            raise
+    for email in taken:
+        errors.append({'row': rows_by_email[email], 'email': email, 'errors': ["Email is already registered."]})
+    remaining = [user for user in users if user.email not in taken]
+    return _create_chunk(remaining, rows_by_email, errors) if remaining else []
@@ -0,0 +1,43 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from organizations.models import Organization
+from users.importer import import_client_users, parse_rows
+
+
+class Command(BaseCommand):
+    help = "Bulk import client users for an organization from a CSV (full_name,email[,is_staff]) or JSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('org_code')
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'json'], help="Defaults to the file extension.")
+        parser.add_argument('--pending', action='store_true', help="Import as pending users awaiting approval.")
+        parser.add_argument('--no-email', action='store_true', help="Don't queue credential emails.")
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        try:
+            organization = Organization.objects.get(code=options['org_code'])
+        except Organization.DoesNotExist:
+            raise CommandError(f"Organization {options['org_code']} not found")
+
+        path = Path(options['path'])
+        fmt = options['format'] or ('json' if path.suffix.lower() == '.json' else 'csv')
+        try:
+            rows = parse_rows(path.read_bytes(), fmt)
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        result = import_client_users(
+            organization,
+            rows,
+            activate=not options['pending'],
+            send_credentials=not options['no_email'],
+            chunk_size=options['chunk_size'],
+        )
+        for error in result['errors']:
+            self.stderr.write(f"Row {error['row']} ({error['email']}): {json.dumps(error['errors'])}")
+        self.stdout.write(self.style.SUCCESS(f"Created {result['created']} users, {len(result['errors'])} rows skipped"))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2 on 2026-10-18 13:22
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_clientuser_status'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='clientuser',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('full_name'), name='gin_trgm_ops'), name='clientuser_name_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='clientuser',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('email'), name='gin_trgm_ops'), name='clientuser_email_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='clientuser',
+            index=models.Index(fields=['organization', 'full_name', 'id'], name='clientuser_org_name_idx'),
+        ),
+    ]
@@ -1,7 +1,10 @@
 from django.db import models
+from django.db.models.functions import Upper
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 from organizations.models import Organization
 from django.utils import timezone
+from core.hashing import make_password
 
 class ClientUserManager(BaseUserManager):
     def create_user(self, email, full_name, password=None, **extra_fields):
@@ -9,7 +12,7 @@ class ClientUserManager(BaseUserManager):
             raise ValueError("The Email field must be set")
         email = self.normalize_email(email)
         user = self.model(email=email, full_name=full_name, **extra_fields)
-        user.set_password(password)
+        user.password = make_password(password)  # hashed in core.hashing's worker pool
         user.save(using=self._db)
         return user
 
@@ -42,6 +45,14 @@ class ClientUser(AbstractBaseUser, PermissionsMixin):
 
     class Meta:
         unique_together = ['organization', 'email']
+        indexes = [
+            # Trigram GIN indexes on UPPER(...) so Django's icontains
+            # (UPPER(col) LIKE UPPER('%q%')) can use them.
+            GinIndex(OpClass(Upper('full_name'), name='gin_trgm_ops'), name='clientuser_name_trgm'),
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='clientuser_email_trgm'),
+            # Keyset order for the directory when there's no search.
+            models.Index(fields=['organization', 'full_name', 'id'], name='clientuser_org_name_idx'),
+        ]
 
     def __str__(self):
         return f"{self.full_name} ({self.organization.code})"
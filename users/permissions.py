@@ -0,0 +1,35 @@
+from rest_framework.permissions import BasePermission
+
+
+class BelongsToOrganization(BasePermission):
+    """
+    The authenticated principal's org claim matches the organization in the URL.
+    Needs no queries: both sides are already on the request.
+    """
+    message = "You do not belong to this organization."
+
+    def has_permission(self, request, view):
+        user = request.user
+        belongs_to = getattr(user, 'belongs_to', None)
+        return bool(belongs_to and belongs_to(getattr(request, 'organization', None)))
+
+
+class IsClientUser(BasePermission):
+    message = "Only client users can perform this action."
+
+    def has_permission(self, request, view):
+        return bool(getattr(request.user, 'is_client', False))
+
+
+class IsSuperAdmin(BasePermission):
+    message = "Unauthorized"
+
+    def has_permission(self, request, view):
+        return bool(getattr(request.user, 'is_super_admin', False))
+
+
+class IsOrganizationStaff(BasePermission):
+    message = "Only organization staff can perform this action."
+
+    def has_permission(self, request, view):
+        return bool(getattr(request.user, 'is_staff', False))
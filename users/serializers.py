@@ -1,9 +1,10 @@
 from rest_framework import serializers
+from core.fieldsets import SparseFieldsetMixin
 from .models import ClientUser
 from workspace.models import Booking
 from workspace.serializers import BookingSummarySerializer
 
-class ClientUserSignupSerializer(serializers.ModelSerializer):
+class ClientUserSignupSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = ClientUser
         fields = ['full_name', 'email', 'notifications_enabled', 'status', 'is_staff', 'is_active']
@@ -47,7 +48,15 @@ class ClientUserSignupSerializer(serializers.ModelSerializer):
         #    raise serializers.ValidationError("Phone number is required.")
         return data
 
-class ClientUserSerializer(serializers.ModelSerializer):
+class ClientUserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = ClientUser
         fields = ['id', 'full_name', 'email', 'date_joined', 'is_active', 'is_staff', 'notifications_enabled']
+
+
+class UserDecisionSerializer(serializers.Serializer):
+    user_id = serializers.IntegerField()
+    decision = serializers.ChoiceField(choices=['accept', 'decline'])
+
+class BulkUserDecisionSerializer(serializers.Serializer):
+    decisions = UserDecisionSerializer(many=True, allow_empty=False, max_length=1000)
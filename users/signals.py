@@ -0,0 +1,41 @@
+from django.db.models.signals import post_save, post_delete
+from django.db import transaction
+from django.dispatch import receiver
+from core import versioning
+from core.caching import dashboard_cache
+from organizations.models import User
+from workspace.autocomplete import USER, autocomplete_index, user_record
+from .models import ClientUser
+from .authentication import user_cache, CLIENT, ADMIN
+
+@receiver(post_save, sender=ClientUser)
+@receiver(post_delete, sender=ClientUser)
+def invalidate_cached_client_user(sender, instance, **kwargs):
+    user_cache.invalidate(CLIENT, instance.pk)
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_admin_user(sender, instance, **kwargs):
+    user_cache.invalidate(ADMIN, instance.pk)
+
+
+@receiver(post_save, sender=ClientUser)
+@receiver(post_delete, sender=ClientUser)
+def invalidate_dashboards(sender, instance, **kwargs):
+    organization_id = instance.organization_id
+    transaction.on_commit(lambda: dashboard_cache.invalidate(organization_id))
+
+
+@receiver(post_save, sender=ClientUser)
+@receiver(post_delete, sender=ClientUser)
+def bump_client_user_version(sender, instance, **kwargs):
+    organization_id = instance.organization_id
+    transaction.on_commit(lambda: versioning.resource_versions.bump(organization_id, versioning.CLIENT_USER))
+
+
+@receiver(post_save, sender=ClientUser)
+@receiver(post_delete, sender=ClientUser)
+def refresh_autocomplete(sender, instance, signal, **kwargs):
+    organization_id, pk = instance.organization_id, instance.pk
+    record = None if signal is post_delete else user_record(instance)
+    transaction.on_commit(lambda: autocomplete_index.refresh(organization_id, USER, pk, record))
@@ -1,3 +1,107 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from organizations.models import Organization
+from workspace.models import Booking, Workspace
+from workspace.views import BookingDetailView
+from .authentication import ADMIN, CLIENT, MANAGE_BOOKINGS, TenantJWTAuthentication, TenantPrincipal, user_cache
+from .models import ClientUser
+from .utils import get_tokens_for_client_user
+from .views import ClientUserImportView
+
+
+class ClientUserImportViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(organization_name="Acme", email="acme@example.com")
+
+    def post(self, data):
+        request = APIRequestFactory().post('/', data, format='json')
+        request.organization = self.organization
+        request.org_code = self.organization.code
+        force_authenticate(request, user=TenantPrincipal(
+            1, ADMIN, 'super_admin', self.organization.id, self.organization.code, 'owner@example.com',
+        ))
+        return ClientUserImportView.as_view()(request, org_code=self.organization.code)
+
+    def test_body_must_be_an_object(self):
+        response = self.post([{'full_name': "Ada", 'email': 'ada@example.com'}])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ClientUser.objects.exists())
+
+    @override_settings(IMPORT_MAX_HTTP_ROWS=2)
+    def test_large_imports_are_refused(self):
+        rows = [{'full_name': f"User {i}", 'email': f'user{i}@example.com'} for i in range(3)]
+
+        response = self.post({'users': rows})
+
+        self.assertEqual(response.status_code, 413)
+        self.assertIn('import_client_users', response.data['detail'])
+        self.assertFalse(ClientUser.objects.exists())
+
+
+class TenantJWTAuthenticationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(organization_name="Acme", email="acme@example.com")
+
+    def setUp(self):
+        self.user = ClientUser.objects.create(
+            organization=self.organization, full_name="Ada", email="ada@example.com",
+        )
+        self.token = get_tokens_for_client_user(self.user)['access']
+        user_cache.clear()
+
+    def authenticate(self, method):
+        request = getattr(APIRequestFactory(), method)('/', HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        return TenantJWTAuthentication().authenticate(Request(request))
+
+    def test_writes_are_refused_for_inactive_users(self):
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertIsNotNone(self.authenticate('get'))
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate('post')
+
+    def test_writes_are_refused_for_deleted_users(self):
+        self.user.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate('post')
+
+
+class BookingPermissionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(organization_name="Acme", email="acme@example.com")
+        owner = ClientUser.objects.create(organization=cls.organization, full_name="Ada", email="ada@example.com")
+        workspace = Workspace.objects.create(organization=cls.organization, name="Desk", type="Desk", capacity=1)
+        start = timezone.now() + timedelta(days=1)
+        cls.booking = Booking.objects.create(
+            workspace=workspace, user=owner, start_time=start, end_time=start + timedelta(hours=1),
+        )
+
+    def principal(self, user_type, role):
+        return TenantPrincipal(99, user_type, role, self.organization.id, self.organization.code)
+
+    def get(self, principal):
+        request = APIRequestFactory().get('/')
+        request.organization = self.organization
+        request.org_code = self.organization.code
+        force_authenticate(request, user=principal)
+        return BookingDetailView.as_view()(request, org_code=self.organization.code, pk=self.booking.pk)
+
+    def test_only_roles_with_manage_bookings_see_other_bookings(self):
+        self.assertEqual(self.get(self.principal(CLIENT, 'staff')).status_code, 200)
+        for user_type, role in ((CLIENT, 'member'), (ADMIN, 'admin'), (ADMIN, 'super_admin')):
+            with self.subTest(role=role):
+                principal = self.principal(user_type, role)
+                self.assertFalse(principal.has_perm(MANAGE_BOOKINGS))
+                self.assertEqual(self.get(principal).status_code, 404)
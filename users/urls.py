@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import ClientUserSignupView, ToggleNotificationView, GetNotificationStatusView, OrganizationUsersView, ApproveOrDeclineUserView
+from .views import ClientUserSignupView, ToggleNotificationView, GetNotificationStatusView, OrganizationUsersView, ApproveOrDeclineUserView, BulkApproveOrDeclineUsersView, ClientUserImportView
 
 urlpatterns = [
     path('signup/', ClientUserSignupView.as_view(), name='client-user-signup'),
@@ -7,6 +7,8 @@ urlpatterns = [
     path('notification-status/', GetNotificationStatusView.as_view(), name='get-notification-status'),
     path('', OrganizationUsersView.as_view(), name='organization-users'),
     path('approve-decline/', ApproveOrDeclineUserView.as_view(), name='approve-decline-user'),
+    path('import/', ClientUserImportView.as_view(), name='client-user-import'),
+    path('approve-decline/bulk/', BulkApproveOrDeclineUsersView.as_view(), name='bulk-approve-decline-users'),
 ]
 # This URL pattern maps the signup endpoint for client users to the ClientUserSignupView.
 # The `org_code` parameter is passed to the view to identify the organization.
@@ -1,11 +1,59 @@
+from django.conf import settings
 from rest_framework_simplejwt.tokens import RefreshToken
 
-def get_tokens_for_client_user(user):
+
+def _tokens_for(user, user_type, role, organization=None):
+    # Tenant claims let users.authentication.TenantJWTAuthentication build the
+    # principal without touching the database.
+    organization = organization or user.organization
     refresh = RefreshToken.for_user(user)
     refresh['user_id'] = user.id
     refresh['email'] = user.email
-    refresh['type'] = 'client'
+    refresh['type'] = user_type
+    refresh['role'] = role
+    refresh['org_id'] = organization.id if organization else None
+    refresh['org_code'] = organization.code if organization else None
     return {
         'refresh': str(refresh),
         'access': str(refresh.access_token),
     }
+
+def get_tokens_for_client_user(user, organization=None):
+    return _tokens_for(user, 'client', 'staff' if user.is_staff else 'member', organization)
+
+def get_tokens_for_admin_user(user, organization=None):
+    return _tokens_for(user, 'admin', 'super_admin' if user.is_super_admin else 'admin', organization)
+
+
+def credentials_email(user, password, organization):
+    # (subject, message, from_email, recipient_list), as taken by outbox.mail
+    return (
+        'Your Login Credentials',
+        f"Hello {user.full_name},\n\n"
+        f"Here are your login details:\n"
+        f"Email: {user.email}\n"
+        f"User_Id: {user.id}\n"
+        f"Password: {password}\n"
+        f"Login here: {settings.FRONTEND_URL}{organization.code}/login\n\n"
+        f"Please keep this information secure.\n"
+        f"Please kindly be on the lookout for an email stating your request has been approved by an admin,\n"
+        f"If you have any questions, feel free to reach out.\n\n"
+        f"Best regards,\n"
+        f"ISapce Team",
+        settings.EMAIL_HOST_USER,
+        [user.email],
+    )
+
+def approval_email(user, organization):
+    return (
+        'Your Account Has Been Approved',
+        f"Hello {user.full_name},\n\n"
+        f"Your account has been approved.\n\n"
+        f"Login here: {settings.FRONTEND_URL}{organization.code}/login\n\n"
+        f"Welcome aboard!\n\n"
+        f"Best regards,\n"
+        f"ISapce Team\n\n"
+        f"If you have any questions, feel free to reach out to us via email at samsoncoded@gmail.com",
+        settings.EMAIL_HOST_USER,
+        [user.email],
+    )
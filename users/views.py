@@ -2,29 +2,40 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth.hashers import check_password
-from organizations.models import Organization
 import secrets
-from rest_framework_simplejwt.authentication import JWTAuthentication
-from django.core.mail import send_mail
+from .authentication import TenantJWTAuthentication, user_cache, CLIENT
+from django.db import transaction
+from outbox.mail import enqueue_mail, enqueue_mass_mail
 from django.conf import settings
 #from django.contrib.auth.hashers import make_password
 from .models import ClientUser
 from rest_framework.permissions import IsAuthenticated
-from .serializers import ClientUserSignupSerializer
-from django.shortcuts import get_object_or_404
+from .serializers import ClientUserSignupSerializer, BulkUserDecisionSerializer
+from .utils import credentials_email, approval_email
+from .importer import import_client_users, max_http_rows, parse_rows
+from rest_framework.parsers import JSONParser, MultiPartParser
+from .permissions import BelongsToOrganization, IsSuperAdmin
 from rest_framework.generics import ListAPIView
-from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from django.db.models import FloatField, Q
+from django.db.models.functions import Cast, Greatest
+from django.contrib.postgres.search import TrigramSimilarity
+from core.fast_serializers import FastListMixin
+from core.fieldsets import SparseQuerysetMixin
+from core.pagination import KeysetPaginationMixin
+from core.versioning import CLIENT_USER, ConditionalListMixin, resource_versions
 from rest_framework.pagination import PageNumberPagination
+from workspace.autocomplete import autocomplete_index
 from workspace.models import Booking
 from workspace.serializers import BookingSummarySerializer
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 
 class ClientUserSignupView(APIView):
+    @transaction.atomic
     def post(self, request, org_code):
-        try:
-            organization = Organization.objects.get(code=org_code)
-        except Organization.DoesNotExist:
+        organization = request.organization
+        if organization is None:
             return Response({'detail': 'Invalid organization code'}, status=status.HTTP_404_NOT_FOUND)
 
         serializer = ClientUserSignupSerializer(data=request.data, context={'organization': organization})
@@ -43,23 +54,7 @@ class ClientUserSignupView(APIView):
             )
 
             # Send login credentials via email
-            send_mail(
-                subject='Your Login Credentials',
-                message=f"Hello {client_user.full_name},\n\n"
-                        f"Here are your login details:\n"
-                        f"Email: {client_user.email}\n"
-                        f"User_Id: {client_user.id}\n"
-                        f"Password: {plain_password}\n"
-                        f"Login here: {settings.FRONTEND_URL}{organization.code}/login\n\n"
-                        f"Please keep this information secure.\n"
-                        f"Please kindly be on the lookout for an email stating your request has been approved by an admin,\n"
-                        f"If you have any questions, feel free to reach out.\n\n"
-                        f"Best regards,\n"
-                        f"ISapce Team",
-                from_email=settings.EMAIL_HOST_USER,
-                recipient_list=[client_user.email],
-                fail_silently=False,
-            )
+            enqueue_mail(*credentials_email(client_user, plain_password, organization))
 
             return Response({'message': 'Client created successfully. Awaiting admin approval.'}, status=status.HTTP_201_CREATED)
 
@@ -71,9 +66,8 @@ class ClientUserLoginView(APIView):
         email = request.data.get('email')
         password = request.data.get('password')
 
-        try:
-            organization = Organization.objects.get(code=org_code)
-        except Organization.DoesNotExist:
+        organization = request.organization
+        if organization is None:
             return Response({"error": "Invalid organization"}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
@@ -97,23 +91,24 @@ class ClientUserLoginView(APIView):
         })
     
 class ToggleNotificationView(APIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [TenantJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request, org_code):
         user = request.user
 
         # Ensure user is a client of the right organization
-        try:
-            organization = Organization.objects.get(code=org_code)
-        except Organization.DoesNotExist:
+        organization = request.organization
+        if organization is None:
             return Response({"detail": "Invalid organization code"}, status=status.HTTP_404_NOT_FOUND)
 
-        if not hasattr(user, "organization") or user.organization != organization:
+        if not user.is_client or not user.belongs_to(organization):
             return Response({"detail": "You do not belong to this organization."}, status=status.HTTP_403_FORBIDDEN)
 
+        # Read fresh rather than from the principal's cache before writing.
+        user = ClientUser.objects.get(pk=user.id)
         user.notifications_enabled = not user.notifications_enabled
-        user.save()
+        user.save(update_fields=['notifications_enabled'])
 
         return Response({
             "message": f"Email notifications {'enabled' if user.notifications_enabled else 'disabled'}",
@@ -121,23 +116,26 @@ class ToggleNotificationView(APIView):
         }, status=status.HTTP_200_OK)
     
 class GetNotificationStatusView(APIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [TenantJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request, org_code):
         user = request.user
 
         # Check organization match
-        try:
-            organization = Organization.objects.get(code=org_code)
-        except Organization.DoesNotExist:
+        organization = request.organization
+        if organization is None:
             return Response({"detail": "Invalid organization code"}, status=status.HTTP_404_NOT_FOUND)
 
-        if not hasattr(user, "organization") or user.organization != organization:
+        if not user.is_client or not user.belongs_to(organization):
             return Response({"detail": "You do not belong to this organization."}, status=status.HTTP_403_FORBIDDEN)
 
+        notifications_enabled = ClientUser.objects.filter(pk=user.id).values_list(
+            'notifications_enabled', flat=True
+        ).first()
+
         return Response({
-            "notifications_enabled": user.notifications_enabled
+            "notifications_enabled": notifications_enabled
         }, status=status.HTTP_200_OK)
     
 class StandardResultsSetPagination(PageNumberPagination):
@@ -145,27 +143,42 @@ class StandardResultsSetPagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 100
 
-class OrganizationUsersView(ListAPIView):
+class OrganizationUsersView(ConditionalListMixin, FastListMixin, SparseQuerysetMixin, KeysetPaginationMixin, ListAPIView):
     serializer_class = ClientUserSignupSerializer
     pagination_class = StandardResultsSetPagination
+    etag_resources = (CLIENT_USER,)
+
+    def get_search_query(self):
+        return self.request.query_params.get('search', '').strip()
 
     def get_queryset(self):
-        org_code = self.kwargs['org_code']
-        organization = get_object_or_404(Organization, code=org_code)
-        query = self.request.query_params.get('search', '')
+        organization = self.request.organization
+        if organization is None:
+            raise NotFound("Organization not found.")
+        query = self.get_search_query()
+
+        queryset = ClientUser.objects.filter(organization=organization)
+        if not query:
+            return queryset.order_by('full_name', 'id')
 
-        return ClientUser.objects.filter(
-            organization=organization
-        ).filter(
+        # icontains is served by the UPPER(...) trigram indexes; similarity
+        # is only computed for rows that already matched.
+        return queryset.filter(
             Q(full_name__icontains=query) | Q(email__icontains=query)
-        )
+        ).annotate(
+            # similarity() is a real; keyset cursors need a double (see core.pagination).
+            similarity=Cast(Greatest(
+                TrigramSimilarity('full_name', query),
+                TrigramSimilarity('email', query),
+            ), FloatField())
+        ).order_by('-similarity', 'id')
     
 @method_decorator(csrf_exempt, name='dispatch')
 class ApproveOrDeclineUserView(APIView):
+    @transaction.atomic
     def patch(self, request, org_code, user_id):
-        try:
-            organization = Organization.objects.get(code=org_code)
-        except Organization.DoesNotExist:
+        organization = request.organization
+        if organization is None:
             return Response({'detail': 'Invalid organization code'}, status=status.HTTP_404_NOT_FOUND)
 
         try:
@@ -181,19 +194,7 @@ class ApproveOrDeclineUserView(APIView):
             user.save()
 
             # Email credentials
-            send_mail(
-                subject='Your Account Has Been Approved',
-                message=f"Hello {user.full_name},\n\n"
-                        f"Your account has been approved.\n\n"
-                        f"Login here: {settings.FRONTEND_URL}{organization.code}/login\n\n"
-                        f"Welcome aboard!\n\n"
-                        f"Best regards,\n"
-                        f"ISapce Team\n\n"
-                        f"If you have any questions, feel free to reach out to us via email at samsoncoded@gmail.com",
-                from_email=settings.EMAIL_HOST_USER,
-                recipient_list=[user.email],
-                fail_silently=False,
-            )
+            enqueue_mail(*approval_email(user, organization))
             return Response({'message': 'User approved and email sent.'}, status=status.HTTP_200_OK)
 
         elif decision == 'decline':
@@ -202,6 +203,94 @@ class ApproveOrDeclineUserView(APIView):
 
         return Response({'detail': 'Invalid decision. Must be "accept" or "decline".'}, status=status.HTTP_400_BAD_REQUEST)
 
+class BulkApproveOrDeclineUsersView(APIView):
+    permission_classes = [IsAuthenticated, IsSuperAdmin, BelongsToOrganization]
+
+    @transaction.atomic
+    def post(self, request, org_code):
+        organization = request.organization
+        if organization is None:
+            return Response({'detail': 'Invalid organization code'}, status=status.HTTP_404_NOT_FOUND)
+
+        serializer = BulkUserDecisionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        # Last decision wins if an id is sent twice.
+        decisions = {item['user_id']: item['decision'] for item in serializer.validated_data['decisions']}
+
+        found = list(ClientUser.objects.filter(
+            organization=organization, id__in=decisions
+        ).select_for_update().only('id', 'full_name', 'email', 'is_active', 'status'))
+        # Only pending signups are decided; active accounts are left alone.
+        users = {user.id: user for user in found if user.status == 'Pending'}
+        skipped = [user.id for user in found if user.id not in users]
+
+        approved = [users[user_id] for user_id, decision in decisions.items() if decision == 'accept' and user_id in users]
+        declined = [user_id for user_id, decision in decisions.items() if decision == 'decline' and user_id in users]
+
+        for user in approved:
+            user.is_active = True
+            user.status = 'Active'
+        ClientUser.objects.bulk_update(approved, ['is_active', 'status'])
+        for user in approved:
+            # bulk_update() skips post_save, which normally does this.
+            user_cache.invalidate(CLIENT, user.id)
+        if approved:
+            transaction.on_commit(lambda: resource_versions.bump(organization.id, CLIENT_USER))
+            transaction.on_commit(lambda: autocomplete_index.invalidate(organization.id))
+        if declined:
+            ClientUser.objects.filter(id__in=declined).delete()
+        enqueue_mass_mail([approval_email(user, organization) for user in approved])
+
+        outcome = {'accept': 'approved', 'decline': 'declined'}
+        results = []
+        for user_id, decision in decisions.items():
+            if user_id in users:
+                result = outcome[decision]
+            elif user_id in skipped:
+                result = 'skipped'  # not pending
+            else:
+                result = 'not_found'
+            results.append({'user_id': user_id, 'result': result})
+        return Response({
+            'approved': len(approved),
+            'declined': len(declined),
+            'skipped': skipped,
+            'results': results,
+        }, status=status.HTTP_200_OK)
+
+class ClientUserImportView(APIView):
+    permission_classes = [IsAuthenticated, IsSuperAdmin, BelongsToOrganization]
+    parser_classes = [JSONParser, MultiPartParser]
+
+    def post(self, request, org_code):
+        organization = request.organization
+        if organization is None:
+            return Response({'detail': 'Invalid organization code'}, status=status.HTTP_404_NOT_FOUND)
+
+        upload = request.FILES.get('file')
+        try:
+            if upload is not None:
+                fmt = 'json' if upload.name.lower().endswith('.json') else 'csv'
+                rows = parse_rows(upload.read(), fmt)
+            else:
+                rows = request.data.get('users') if isinstance(request.data, dict) else None
+                if not isinstance(rows, list):
+                    raise ValueError('Provide a "users" list or a CSV/JSON "file".')
+        except (ValueError, UnicodeDecodeError) as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        limit = max_http_rows()
+        if len(rows) > limit:
+            return Response(
+                {'detail': f'At most {limit} users can be imported per request; '
+                           'use the import_client_users management command for larger files.'},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+
+        activate = str(request.query_params.get('activate', 'true')).lower() != 'false'
+        result = import_client_users(organization, rows, activate=activate)
+        return Response(result, status=status.HTTP_201_CREATED if result['created'] else status.HTTP_200_OK)
+
 # This code defines a Django view for handling user signup in an organization.
 # It includes a class-based view that processes POST requests to create a new client user.
 # This view handles the signup process for client users.
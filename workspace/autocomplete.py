@@ -0,0 +1,225 @@
+"""
+Per-process autocomplete index.
+
+For each organization, workspace names and active users' names and emails
+are kept as sorted lists of normalized keys. A label is indexed from the
+start and from every later word, so "ro" finds "Meeting Room" and "sm"
+finds "Jane Smith"; a bisect finds the first key with the typed prefix.
+Matches on the whole label come before word matches.
+
+Indexes are built lazily and dropped after commit when a workspace or
+client user changes in this process (see the signals). Other workers'
+writes are noticed through core.versioning: an index remembers the
+organization's workspace and client user versions it was built from and
+is rebuilt once either moves. That needs a shared cache; without one,
+indexes only expire after AUTOCOMPLETE_INDEX_TTL seconds (30 by default,
+300 with a shared cache). At most AUTOCOMPLETE_MAX_ORGANIZATIONS indexes
+are kept, least recently used first out. An organization with more than AUTOCOMPLETE_MAX_ENTRIES
+workspaces or users isn't indexed; its lookups go to the database.
+"""
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import Q
+
+from core import versioning
+from users.models import ClientUser
+from .models import Workspace
+
+WORKSPACE = 'workspace'
+USER = 'user'
+KINDS = (WORKSPACE, USER)
+
+DEFAULT_TTL = 300
+DEFAULT_UNSHARED_TTL = 30
+VERSIONED = (versioning.WORKSPACE, versioning.CLIENT_USER)
+DEFAULT_MAX_ENTRIES = 20000
+DEFAULT_MAX_ORGANIZATIONS = 256
+
+
+def normalize(value):
+    return ' '.join(value.casefold().split())
+
+
+def _word_starts(key):
+    """`key` from each word after the first, e.g. 'room blue', 'blue'."""
+    return [key[i + 1:] for i, char in enumerate(key) if char == ' ']
+
+
+def workspace_record(workspace):
+    return {'type': WORKSPACE, 'id': workspace.id, 'label': workspace.name}
+
+
+def user_record(user):
+    if not user.is_active:
+        return None
+    return {'type': USER, 'id': user.id, 'label': user.full_name, 'email': user.email}
+
+
+class OrganizationIndex:
+    def __init__(self, records):
+        self.built_at = time.monotonic()
+        self.records = {}
+        # Sorted (key, kind, id) per tier: whole labels and emails first,
+        # then word starts.
+        self._tiers = ([], [])
+        for record in records:
+            ref = (record['type'], record['id'])
+            self.records[ref] = record
+            keys = [normalize(record['label'])]
+            if record.get('email'):
+                keys.append(normalize(record['email']))
+            for key in keys:
+                if key:
+                    self._tiers[0].append((key, *ref))
+                    self._tiers[1].extend((word, *ref) for word in _word_starts(key))
+        for tier in self._tiers:
+            tier.sort()
+
+    def search(self, prefix, kind=None, limit=10):
+        prefix = normalize(prefix)
+        found = {}
+        for tier in self._tiers:
+            i = bisect_left(tier, (prefix,))
+            while i < len(tier) and len(found) < limit:
+                key, record_kind, record_id = tier[i]
+                if not key.startswith(prefix):
+                    break
+                if kind is None or record_kind == kind:
+                    found.setdefault((record_kind, record_id), None)
+                i += 1
+        return [self.records[ref] for ref in found]
+
+
+# Stored for organizations over the size limit, so they aren't reloaded on
+# every keystroke.
+_TOO_LARGE = object()
+
+
+class AutocompleteIndex:
+    def __init__(self):
+        self._indexes = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+        self._build_locks = {}
+
+    @property
+    def ttl(self):
+        default = DEFAULT_TTL if versioning.resource_versions.shared else DEFAULT_UNSHARED_TTL
+        return getattr(settings, 'AUTOCOMPLETE_INDEX_TTL', default)
+
+    def _versions(self, organization_id):
+        if not versioning.resource_versions.shared:
+            return None
+        return versioning.resource_versions.get(organization_id, VERSIONED)
+
+    @property
+    def max_entries(self):
+        return getattr(settings, 'AUTOCOMPLETE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)
+
+    @property
+    def max_organizations(self):
+        return getattr(settings, 'AUTOCOMPLETE_MAX_ORGANIZATIONS', DEFAULT_MAX_ORGANIZATIONS)
+
+    def _build(self, organization_id):
+        limit = self.max_entries
+        workspaces = list(
+            Workspace.objects.filter(organization_id=organization_id).values_list('id', 'name')[:limit + 1]
+        )
+        users = list(
+            ClientUser.objects.filter(
+                organization_id=organization_id, is_active=True
+            ).values_list('id', 'full_name', 'email')[:limit + 1]
+        )
+        if len(workspaces) > limit or len(users) > limit:
+            return _TOO_LARGE, time.monotonic()
+        records = [{'type': WORKSPACE, 'id': pk, 'label': name} for pk, name in workspaces]
+        records += [{'type': USER, 'id': pk, 'label': name, 'email': email} for pk, name, email in users]
+        index = OrganizationIndex(records)
+        return index, index.built_at
+
+    def _get(self, organization_id, versions):
+        with self._lock:
+            entry = self._indexes.get(organization_id)
+            if entry is None:
+                return None
+            index, built_at, built_versions = entry
+            if time.monotonic() - built_at >= self.ttl or built_versions != versions:
+                return None
+            self._indexes.move_to_end(organization_id)
+            return index
+
+    def index(self, organization_id):
+        """The organization's OrganizationIndex, or None if it's too large."""
+        versions = self._versions(organization_id)
+        index = self._get(organization_id, versions)
+        if index is None:
+            with self._lock:
+                build_lock = self._build_locks.setdefault(organization_id, threading.Lock())
+            with build_lock:
+                # Another thread may have built it while we waited.
+                index = self._get(organization_id, versions)
+                if index is None:
+                    generation = self._generations.get(organization_id, 0)
+                    # `versions` were read before the rows, so a write during
+                    # the build leaves them behind and the next lookup rebuilds.
+                    index, built_at = self._build(organization_id)
+                    with self._lock:
+                        # Don't keep an index that a concurrent write already outdated.
+                        if self._generations.get(organization_id, 0) == generation:
+                            self._indexes[organization_id] = (index, built_at, versions)
+                            self._indexes.move_to_end(organization_id)
+                            while len(self._indexes) > self.max_organizations:
+                                evicted, _ = self._indexes.popitem(last=False)
+                                self._build_locks.pop(evicted, None)
+                                self._generations.pop(evicted, None)
+        return None if index is _TOO_LARGE else index
+
+    def invalidate(self, organization_id):
+        with self._lock:
+            self._generations[organization_id] = self._generations.get(organization_id, 0) + 1
+            self._indexes.pop(organization_id, None)
+
+    def refresh(self, organization_id, kind, pk, record):
+        """
+        Drop the organization's index unless it already holds `record` (None
+        for a row that shouldn't be listed) for (kind, pk). Saves that don't
+        touch a name or email, like a workspace's status flipping, keep it.
+        """
+        with self._lock:
+            entry = self._indexes.get(organization_id)
+        if entry is not None and isinstance(entry[0], OrganizationIndex):
+            if entry[0].records.get((kind, pk)) == record:
+                return
+        self.invalidate(organization_id)
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
+
+    def search(self, organization_id, prefix, kind=None, limit=10):
+        index = self.index(organization_id)
+        if index is not None:
+            return index.search(prefix, kind, limit)
+
+        prefix = normalize(prefix)
+        results = []
+        # Served by the UPPER(...) trigram indexes.
+        if kind in (None, WORKSPACE):
+            workspaces = Workspace.objects.filter(organization_id=organization_id).filter(
+                Q(name__istartswith=prefix) | Q(name__icontains=f' {prefix}')
+            ).order_by('name', 'id')[:limit]
+            results += [workspace_record(workspace) for workspace in workspaces.only('id', 'name')]
+        if kind in (None, USER) and len(results) < limit:
+            users = ClientUser.objects.filter(organization_id=organization_id, is_active=True).filter(
+                Q(full_name__istartswith=prefix) | Q(full_name__icontains=f' {prefix}')
+                | Q(email__istartswith=prefix)
+            ).order_by('full_name', 'id')[:limit - len(results)]
+            results += [user_record(user) for user in users.only('id', 'full_name', 'email', 'is_active')]
+        return results
+
+
+autocomplete_index = AutocompleteIndex()
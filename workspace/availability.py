@@ -0,0 +1,136 @@
+"""
+Per-process availability index.
+
+Live bookings are kept per organization as sorted start/end lists per
+workspace. booking_no_overlap guarantees they never overlap, so one bisect
+answers "is workspace X free in [a, b)". Timelines are built lazily, dropped
+by the signals in this process and expire after AVAILABILITY_INDEX_TTL
+seconds to pick up other workers' writes; the constraint still guards
+every booking insert.
+"""
+import threading
+import time
+from bisect import bisect_right
+from datetime import datetime
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Booking, Workspace
+
+DEFAULT_TTL = 30
+
+
+def aware(value):
+    if isinstance(value, datetime) and timezone.is_naive(value):
+        return timezone.make_aware(value)
+    return value
+
+
+class OrganizationTimeline:
+    def __init__(self, workspace_ids, bookings, since):
+        # Bookings that ended before `since` are not loaded; windows that
+        # start earlier than that are answered from the database instead.
+        self.since = since
+        self.built_at = time.monotonic()
+        self.workspace_ids = frozenset(workspace_ids)
+        self._starts = {}
+        self._ends = {}
+        for workspace_id, start, end in bookings:
+            self._starts.setdefault(workspace_id, []).append(start)
+            self._ends.setdefault(workspace_id, []).append(end)
+
+    def covers(self, start):
+        return start >= self.since
+
+    def is_free(self, workspace_id, start, end):
+        ends = self._ends.get(workspace_id)
+        if not ends:
+            return True
+        # First booking that ends after `start`; it's the only one that can
+        # still overlap, because later ones start after it ends.
+        i = bisect_right(ends, start)
+        return i == len(ends) or self._starts[workspace_id][i] >= end
+
+    def free_workspace_ids(self, start, end):
+        return {ws_id for ws_id in self.workspace_ids if self.is_free(ws_id, start, end)}
+
+
+class AvailabilityIndex:
+    def __init__(self):
+        self._timelines = {}
+        self._generations = {}
+        self._lock = threading.Lock()
+        self._build_locks = {}
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'AVAILABILITY_INDEX_TTL', DEFAULT_TTL)
+
+    def _build(self, organization_id):
+        # Start at midnight so "is it free today" queries stay in memory.
+        since = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        workspace_ids = Workspace.objects.filter(
+            organization_id=organization_id
+        ).values_list('id', flat=True)
+        bookings = Booking.objects.filter(
+            workspace__organization_id=organization_id,
+            end_time__gt=since,
+        ).exclude(
+            status='CANCELLED'
+        ).order_by('workspace_id', 'start_time').values_list('workspace_id', 'start_time', 'end_time')
+        return OrganizationTimeline(list(workspace_ids), bookings.iterator(), since)
+
+    def timeline(self, organization_id):
+        timeline = self._timelines.get(organization_id)
+        if timeline is not None and time.monotonic() - timeline.built_at < self.ttl:
+            return timeline
+
+        with self._lock:
+            build_lock = self._build_locks.setdefault(organization_id, threading.Lock())
+        with build_lock:
+            # Another thread may have rebuilt it while we waited.
+            timeline = self._timelines.get(organization_id)
+            if timeline is None or time.monotonic() - timeline.built_at >= self.ttl:
+                generation = self._generations.get(organization_id, 0)
+                timeline = self._build(organization_id)
+                # Don't keep a timeline that a concurrent write already outdated.
+                if self._generations.get(organization_id, 0) == generation:
+                    self._timelines[organization_id] = timeline
+        return timeline
+
+    def invalidate(self, organization_id):
+        with self._lock:
+            self._generations[organization_id] = self._generations.get(organization_id, 0) + 1
+            self._timelines.pop(organization_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._timelines.clear()
+
+    def is_available(self, organization_id, workspace_id, start, end):
+        start, end = aware(start), aware(end)
+        timeline = self.timeline(organization_id)
+        if not timeline.covers(start):
+            return not Booking.objects.filter(
+                workspace_id=workspace_id,
+                workspace__organization_id=organization_id,
+                start_time__lt=end,
+                end_time__gt=start,
+            ).exclude(status='CANCELLED').exists()
+        return timeline.is_free(int(workspace_id), start, end)
+
+    def available_workspace_ids(self, organization_id, start, end):
+        start, end = aware(start), aware(end)
+        timeline = self.timeline(organization_id)
+        if not timeline.covers(start):
+            booked = Booking.objects.filter(
+                workspace__organization_id=organization_id,
+                start_time__lt=end,
+                end_time__gt=start,
+            ).exclude(status='CANCELLED').values_list('workspace_id', flat=True)
+            return set(timeline.workspace_ids) - set(booked)
+        return timeline.free_workspace_ids(start, end)
+
+
+availability_index = AvailabilityIndex()
@@ -3,24 +3,37 @@ from .models import Workspace, Booking
 
 
 class CommaSeparatedListFilter(django_filters.BaseInFilter, django_filters.CharFilter):
+    """
+    ?amenities=wifi,projector: workspaces with every listed amenity, or
+    with at least one of them for match='any'. Compared case-insensitively
+    against Workspace.amenity_keys, so either is one GIN index probe.
+    """
+    def __init__(self, *args, match='all', **kwargs):
+        self.match = match
+        kwargs.setdefault('field_name', 'amenity_keys')
+        super().__init__(*args, **kwargs)
+
     def filter(self, qs, value):
-        if value:
-            values = value.split(',')
-            for val in values:
-                qs = qs.filter(amenities__icontains=val)
+        values = sorted({val.strip().lower() for val in value or () if val.strip()})
+        if not values:
             return qs
-        return qs
+        if self.match == 'any':
+            return qs.filter(**{f'{self.field_name}__has_any_keys': values})
+        return qs.filter(**{f'{self.field_name}__contains': values})
 
 
 class WorkspaceFilter(django_filters.FilterSet):
     type = django_filters.CharFilter(field_name="type", lookup_expr='iexact')
     amenities = CommaSeparatedListFilter()
+    amenities_any = CommaSeparatedListFilter(match='any')
     min_capacity = django_filters.NumberFilter(field_name="capacity", lookup_expr='gte')
     max_capacity = django_filters.NumberFilter(field_name="capacity", lookup_expr='lte')
+    # Annotated by WorkspaceQuerySet.with_availability()
+    is_available = django_filters.BooleanFilter(field_name="is_available")
 
     class Meta:
         model = Workspace
-        fields = ['type', 'amenities', 'min_capacity', 'max_capacity']
+        fields = ['type', 'amenities', 'amenities_any', 'min_capacity', 'max_capacity', 'is_available']
 
 class BookingFilter(django_filters.FilterSet):
     start_date = django_filters.DateTimeFilter(field_name="start_time", lookup_expr='gte')
@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.fast_serializers import compile_plan
+from organizations.models import Organization
+from workspace.models import Workspace
+from workspace.serializers import WorkspaceSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Time a workspace list page through WorkspaceSerializer and through "
+        "core.fast_serializers. Sample rows are created in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=5, help="Best of this many runs is reported.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            organization = Organization.objects.create(
+                organization_name="Benchmark", email="benchmark@example.invalid",
+            )
+            Workspace.objects.bulk_create([
+                Workspace(
+                    organization=organization,
+                    name=f"Workspace {i:05d}",
+                    type=Workspace.WORKSPACE_TYPE_CHOICES[i % len(Workspace.WORKSPACE_TYPE_CHOICES)][0],
+                    capacity=i % 12 + 1,
+                    description=f"Sample workspace number {i}" if i % 3 else None,
+                    amenities=["wifi", "monitor"][:i % 3],
+                )
+                for i in range(options['rows'])
+            ])
+            queryset = Workspace.objects.filter(organization=organization).with_availability().order_by('name', 'id')
+            serializer = WorkspaceSerializer()
+
+            def serializer_path():
+                return WorkspaceSerializer(list(queryset), many=True).data
+
+            def fast_path():
+                plan = compile_plan(serializer, queryset)
+                return plan.render(queryset.values_list(*plan.columns, named=True))
+
+            if serializer_path() != fast_path():
+                self.stderr.write(self.style.ERROR("Outputs differ"))
+            slow = min(_timed(serializer_path) for _ in range(options['repeat']))
+            fast = min(_timed(fast_path) for _ in range(options['repeat']))
+            transaction.set_rollback(True)
+
+        rows = options['rows']
+        self.stdout.write(f"Serializer: {slow * 1000:.1f} ms ({slow / rows * 1e6:.1f} us/row)")
+        self.stdout.write(f"Fast path:  {fast * 1000:.1f} ms ({fast / rows * 1e6:.1f} us/row)")
+        self.stdout.write(self.style.SUCCESS(f"Speedup: {slow / fast:.1f}x"))
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
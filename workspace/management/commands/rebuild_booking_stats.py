@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from core.caching import dashboard_cache
+from organizations.models import Organization
+from workspace.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = "Backfill or repair the daily booking rollups from the bookings table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--org', help="Only rebuild this organization code.")
+        parser.add_argument('--since', help="Only rebuild days from this date (YYYY-MM-DD) onwards.")
+
+    def handle(self, *args, **options):
+        organization = None
+        if options['org']:
+            try:
+                organization = Organization.objects.get(code=options['org'])
+            except Organization.DoesNotExist:
+                raise CommandError(f"Organization {options['org']} not found")
+
+        since = None
+        if options['since']:
+            since = parse_date(options['since'])
+            if since is None:
+                raise CommandError("--since must be a date (YYYY-MM-DD)")
+
+        written = rebuild(organization=organization, since=since)
+        # Dashboards may have cached totals from before the rebuild.
+        organization_ids = [organization.pk] if organization else Organization.objects.values_list('pk', flat=True)
+        for organization_id in organization_ids:
+            dashboard_cache.invalidate(organization_id)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} daily booking rows"))
@@ -0,0 +1,45 @@
+# Generated by Django 5.2 on 2026-10-18 13:13
+
+import django.contrib.postgres.constraints
+from django.contrib.postgres.operations import BtreeGistExtension
+import django.contrib.postgres.fields.ranges
+import workspace.models
+from django.db import migrations, models
+from django.db.models import F
+
+
+def resolve_existing_overlaps(apps, schema_editor):
+    # The constraint can't be added while legacy double bookings exist, so
+    # collapse inverted ranges and cancel the later of any overlapping pair.
+    Booking = apps.get_model('workspace', 'Booking')
+    Booking.objects.filter(end_time__lt=F('start_time')).update(end_time=F('start_time'))
+
+    live = Booking.objects.exclude(status='CANCELLED').order_by('workspace_id', 'start_time', 'id')
+    last_end = {}
+    for booking in live.iterator():
+        previous_end = last_end.get(booking.workspace_id)
+        if previous_end is not None and booking.start_time < previous_end:
+            Booking.objects.filter(pk=booking.pk).update(status='CANCELLED')
+            continue
+        last_end[booking.workspace_id] = booking.end_time
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspace', '0011_alter_workspace_created_at'),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.RunPython(resolve_existing_overlaps, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='booking',
+            name='period',
+            field=models.GeneratedField(db_persist=True, expression=workspace.models.TsTzRange('start_time', 'end_time', django.contrib.postgres.fields.ranges.RangeBoundary()), output_field=django.contrib.postgres.fields.ranges.DateTimeRangeField()),
+        ),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(condition=models.Q(('status', 'CANCELLED'), _negated=True), expressions=[('workspace', '='), ('period', '&&')], name='booking_no_overlap'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-18 13:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspace', '0012_booking_period_no_overlap'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['user', 'start_time', 'id'], name='booking_user_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workspace',
+            index=models.Index(fields=['organization', 'name', 'id'], name='workspace_org_name_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_workspace_organization(apps, schema_editor):
+    Booking = apps.get_model('workspace', 'Booking')
+    Workspace = apps.get_model('workspace', 'Workspace')
+    Booking.objects.update(
+        organization_id=models.Subquery(
+            Workspace.objects.filter(pk=models.OuterRef('workspace_id')).values('organization_id')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0003_activationtoken_password'),
+        ('workspace', '0013_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='organization',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to='organizations.organization'),
+        ),
+        migrations.RunPython(copy_workspace_organization, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Separate from 0014 so the backfill's deferred FK checks have fired
+    # before the column is altered.
+
+    dependencies = [
+        ('organizations', '0003_activationtoken_password'),
+        ('workspace', '0014_booking_organization'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='booking',
+            name='organization',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to='organizations.organization'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['organization', 'status', 'start_time'], name='booking_org_status_start_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-18 13:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0003_activationtoken_password'),
+        ('workspace', '0015_booking_organization_not_null'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('created', models.IntegerField(default=0)),
+                ('cancelled', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('booked_minutes', models.BigIntegerField(default=0)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='booking_daily_stats', to='organizations.organization')),
+                ('workspace', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='workspace.workspace')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['organization', 'day'], name='booking_daily_stat_org_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('workspace', 'day'), name='booking_daily_stat_workspace_day')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-18 13:34
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0003_activationtoken_password'),
+        ('workspace', '0017_delta_sync'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='workspace',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass('name', name='gin_trgm_ops'), name='workspace_name_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='workspace',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='workspace_name_upper_trgm'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-18 13:34
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0003_activationtoken_password'),
+        ('workspace', '0018_workspace_name_trigram'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workspace',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('name', config='english', weight='A'), '||', django.contrib.postgres.search.SearchVector('type', django.db.models.functions.comparison.Cast('amenities', models.TextField()), config='english', weight='B'), django.contrib.postgres.search.SearchConfig('english')), '||', django.contrib.postgres.search.SearchVector('description', config='english', weight='C'), django.contrib.postgres.search.SearchConfig('english')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='workspace',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='workspace_search_vector_idx'),
+        ),
+    ]
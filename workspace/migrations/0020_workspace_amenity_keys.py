@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-18 13:38
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0003_activationtoken_password'),
+        ('workspace', '0019_workspace_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workspace',
+            name='amenity_keys',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.comparison.Cast(django.db.models.functions.text.Lower(django.db.models.functions.comparison.Cast('amenities', models.TextField())), models.JSONField()), output_field=models.JSONField()),
+        ),
+        migrations.AddIndex(
+            model_name='workspace',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['amenity_keys'], name='workspace_amenity_keys_idx'),
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.2 on 2026-10-18 13:51
+
+from django.db import migrations, models
+
+SYNC_TABLES = ('workspace_workspace', 'workspace_booking', 'workspace_tombstone')
+
+CREATE_FUNCTION = """
+CREATE FUNCTION workspace_set_sync_xid() RETURNS trigger AS $$
+BEGIN
+    NEW.sync_xid := pg_current_xact_id()::text::bigint;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+CREATE_TRIGGER = """
+CREATE TRIGGER {table}_sync_xid BEFORE INSERT OR UPDATE ON {table}
+FOR EACH ROW EXECUTE FUNCTION workspace_set_sync_xid();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0003_activationtoken_password'),
+        ('workspace', '0020_workspace_amenity_keys'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='booking',
+            name='booking_org_updated_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='tombstone',
+            name='tombstone_org_deleted_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='workspace',
+            name='workspace_org_updated_idx',
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='sync_xid',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tombstone',
+            name='sync_xid',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='workspace',
+            name='sync_xid',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['organization', 'sync_xid', 'id'], name='booking_org_sync_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['organization', 'sync_xid', 'id'], name='tombstone_org_sync_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workspace',
+            index=models.Index(fields=['organization', 'sync_xid', 'id'], name='workspace_org_sync_idx'),
+        ),
+        migrations.RunSQL(CREATE_FUNCTION, "DROP FUNCTION workspace_set_sync_xid();"),
+    ] + [
+        migrations.RunSQL(CREATE_TRIGGER.format(table=table), f"DROP TRIGGER {table}_sync_xid ON {table};")
+        for table in SYNC_TABLES
+    ]
@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+def backfill_stats(apps, schema_editor):
+    from workspace.rollups import rebuild
+
+    rebuild(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspace', '0021_sync_xid'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,42 @@
 from django.db import models
+from django.db.models import Exists, Func, OuterRef, Q
 from django.utils import timezone
 from django.conf import settings
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateTimeRangeField, RangeBoundary, RangeOperators
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db.models.functions import Cast, Lower, Upper
 import django.utils.timezone as timezone
 
+
+BOOKING_NO_OVERLAP = 'booking_no_overlap'
+SEARCH_CONFIG = 'english'
+
+
+class TsTzRange(Func):
+    function = 'TSTZRANGE'
+    output_field = DateTimeRangeField()
+
+
+class WorkspaceQuerySet(models.QuerySet):
+    def with_availability(self, as_of=None):
+        # One EXISTS subquery for the whole page instead of a query per row.
+        as_of = as_of or timezone.now()
+        occupied = Booking.objects.filter(
+            workspace=OuterRef('pk'),
+            start_time__lte=as_of,
+            end_time__gt=as_of,
+        ).exclude(status='CANCELLED')
+        return self.annotate(is_available=~Exists(occupied))
+
+
+class WorkspaceManager(models.Manager.from_queryset(WorkspaceQuerySet)):
+    def get_queryset(self):
+        # The tsvector and amenity keys are only ever read inside Postgres.
+        return super().get_queryset().defer('search_vector', 'amenity_keys')
+
+
 class Workspace(models.Model):
     WORKSPACE_TYPE_CHOICES = (
             ("Desk", "Desk"),
@@ -18,16 +52,62 @@ class Workspace(models.Model):
     capacity = models.PositiveIntegerField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Id of the last transaction that wrote the row, set by a trigger on
+    # every INSERT/UPDATE (including queryset.update()). See workspace.sync.
+    sync_xid = models.BigIntegerField(default=0, editable=False)
     description = models.TextField(blank=True, null=True)
     amenities = models.JSONField(default=list, blank=True)  # Removed strict validation
+    # Maintained by Postgres; names weigh most, then type and amenities.
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('name', weight='A', config=SEARCH_CONFIG)
+            + SearchVector('type', Cast('amenities', models.TextField()), weight='B', config=SEARCH_CONFIG)
+            + SearchVector('description', weight='C', config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+    # Lowercased copy of amenities for WorkspaceFilter: @> (all) and ?| (any)
+    # are answered by the GIN index.
+    amenity_keys = models.GeneratedField(
+        expression=Cast(Lower(Cast('amenities', models.TextField())), models.JSONField()),
+        output_field=models.JSONField(),
+        db_persist=True,
+    )
+
+    objects = WorkspaceManager()
+
+    class Meta:
+        indexes = [
+            # Keyset pagination order for workspace lists.
+            models.Index(fields=['organization', 'name', 'id'], name='workspace_org_name_idx'),
+            # Delta sync (workspace.sync) reads changes in this order.
+            models.Index(fields=['organization', 'sync_xid', 'id'], name='workspace_org_sync_idx'),
+            # name % 'q' (fuzzy search) and UPPER(name) LIKE ... (prefix and
+            # icontains) both go through trigram indexes.
+            GinIndex(OpClass('name', name='gin_trgm_ops'), name='workspace_name_trgm'),
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='workspace_name_upper_trgm'),
+            GinIndex(fields=['search_vector'], name='workspace_search_vector_idx'),
+            GinIndex(fields=['amenity_keys'], name='workspace_amenity_keys_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.section.name})"
 
     @property
     def is_available(self):
+        # Set in bulk by WorkspaceQuerySet.with_availability(); the query is
+        # only a fallback for instances loaded without it.
+        if '_is_available' in self.__dict__:
+            return self._is_available
         now = timezone.now()
-        return not self.bookings.filter(start_time__lte=now, end_time__gte=now).exists()
+        return not self.bookings.filter(
+            start_time__lte=now, end_time__gt=now
+        ).exclude(status='CANCELLED').exists()
+
+    @is_available.setter
+    def is_available(self, value):
+        self._is_available = value
 
 
 class Booking(models.Model):
@@ -47,12 +127,131 @@ class Booking(models.Model):
         settings.CLIENT_USER_MODEL,
         on_delete=models.CASCADE
     )
+    # Copied from workspace on save so org-wide booking queries can use an
+    # index instead of joining through workspace.
+    organization = models.ForeignKey(
+        'organizations.Organization',
+        on_delete=models.CASCADE,
+        related_name='bookings',
+        editable=False,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     start_time = models.DateTimeField()
     end_time = models.DateTimeField()
     updated_at = models.DateTimeField(auto_now=True)
+    sync_xid = models.BigIntegerField(default=0, editable=False)  # see Workspace.sync_xid
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    # [start_time, end_time) kept by Postgres so the exclusion constraint can index it
+    period = models.GeneratedField(
+        expression=TsTzRange('start_time', 'end_time', RangeBoundary()),
+        output_field=DateTimeRangeField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        indexes = [
+            # Keyset pagination order for a user's bookings.
+            models.Index(fields=['user', 'start_time', 'id'], name='booking_user_start_idx'),
+            models.Index(fields=['organization', 'status', 'start_time'], name='booking_org_status_start_idx'),
+            # Delta sync (workspace.sync).
+            models.Index(fields=['organization', 'sync_xid', 'id'], name='booking_org_sync_idx'),
+        ]
+        constraints = [
+            ExclusionConstraint(
+                name=BOOKING_NO_OVERLAP,
+                expressions=[
+                    ('workspace', RangeOperators.EQUAL),
+                    ('period', RangeOperators.OVERLAPS),
+                ],
+                condition=~Q(status='CANCELLED'),
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # organization_id was derived from this workspace when it was saved.
+        instance._organization_workspace_id = instance.__dict__.get('workspace_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Only look the organization up for new bookings and workspace moves,
+        # not on every status change.
+        if self.workspace_id and (
+            self.organization_id is None
+            or self.workspace_id != getattr(self, '_organization_workspace_id', None)
+        ):
+            if Booking.workspace.is_cached(self) and self.workspace.pk == self.workspace_id:
+                self.organization_id = self.workspace.organization_id
+            else:
+                self.organization_id = Workspace.objects.values_list('organization_id', flat=True).get(
+                    pk=self.workspace_id
+                )
+            self._organization_workspace_id = self.workspace_id
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.workspace.name} booked by {self.user.full_name}"
-    
\ No newline at end of file
+    
+
+class BookingDailyStat(models.Model):
+    """
+    Per-workspace daily booking rollup, kept up to date by workspace.rollups.
+    `created` is counted on the day a booking was made; cancellations,
+    completions and booked minutes on the day the booking starts.
+    """
+    organization = models.ForeignKey('organizations.Organization', on_delete=models.CASCADE, related_name='booking_daily_stats')
+    workspace = models.ForeignKey(Workspace, on_delete=models.CASCADE, related_name='daily_stats')
+    day = models.DateField()
+    created = models.IntegerField(default=0)
+    cancelled = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    booked_minutes = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['workspace', 'day'], name='booking_daily_stat_workspace_day'),
+        ]
+        indexes = [
+            models.Index(fields=['organization', 'day'], name='booking_daily_stat_org_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.workspace_id} on {self.day}"
+
+
+class Tombstone(models.Model):
+    """
+    Deletion log for delta sync, so clients holding a replica learn which
+    workspaces and bookings to drop. Kept for SYNC_TOMBSTONE_RETENTION_DAYS.
+    """
+    WORKSPACE = 'workspace'
+    BOOKING = 'booking'
+    MODEL_CHOICES = (
+        (WORKSPACE, 'Workspace'),
+        (BOOKING, 'Booking'),
+    )
+
+    # No FK constraint: tombstones are written while an organization's
+    # rows are being cascade-deleted, and may outlive it until purged.
+    organization = models.ForeignKey(
+        'organizations.Organization',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+',
+    )
+    model = models.CharField(max_length=20, choices=MODEL_CHOICES)
+    object_id = models.BigIntegerField()
+    user_id = models.BigIntegerField(null=True, blank=True)  # booking owner
+    deleted_at = models.DateTimeField(default=timezone.now)
+    sync_xid = models.BigIntegerField(default=0, editable=False)  # see Workspace.sync_xid
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['organization', 'sync_xid', 'id'], name='tombstone_org_sync_idx'),
+            # purge_tombstones()
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model} {self.object_id} deleted {self.deleted_at}"
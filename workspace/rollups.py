@@ -0,0 +1,192 @@
+"""
+Daily booking rollups (BookingDailyStat).
+
+Every booking contributes fixed deltas to at most two (workspace, day) rows:
++1 created on its creation day, and +1 cancelled / +1 completed / booked
+minutes on its start day. Saves subtract the booking's previous
+contribution and add the new one in the same transaction as the write;
+deletes subtract it. Days are in the project's TIME_ZONE.
+
+rebuild() recomputes rows from the bookings table. Migration 0022 uses it
+to backfill existing bookings; the rebuild_booking_stats command repairs.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.apps import apps as global_apps
+from django.db import connection, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Extract, Floor, TruncDate
+from django.utils import timezone
+
+from .models import Booking, BookingDailyStat, Workspace
+
+FIELDS = ('created', 'cancelled', 'completed', 'booked_minutes')
+TRACKED = ('organization_id', 'workspace_id', 'created_at', 'start_time', 'end_time', 'status')
+WINDOWS = {'7': 7, '30': 30, '90': 90, 'all': None}
+
+
+def booked_minutes(start, end):
+    return max(int((end - start).total_seconds() // 60), 0)
+
+
+def contribution(row):
+    """{(organization_id, workspace_id, day): {field: delta}} for one booking."""
+    deltas = defaultdict(lambda: dict.fromkeys(FIELDS, 0))
+    org_id, workspace_id = row['organization_id'], row['workspace_id']
+    deltas[(org_id, workspace_id, timezone.localdate(row['created_at']))]['created'] += 1
+    start_day = deltas[(org_id, workspace_id, timezone.localdate(row['start_time']))]
+    if row['status'] == 'CANCELLED':
+        start_day['cancelled'] += 1
+    else:
+        start_day['booked_minutes'] += booked_minutes(row['start_time'], row['end_time'])
+        if row['status'] == 'COMPLETED':
+            start_day['completed'] += 1
+    return deltas
+
+
+def snapshot(booking):
+    return {field: getattr(booking, field) for field in TRACKED}
+
+
+def previous_snapshot(booking):
+    if booking.pk is None:
+        return None
+    rows = Booking.objects.filter(pk=booking.pk)
+    if connection.in_atomic_block:
+        # Serialize concurrent updates of one booking so neither subtracts a
+        # contribution the other already replaced.
+        rows = rows.select_for_update()
+    return rows.values(*TRACKED).first()
+
+
+def _merge(into, deltas, sign):
+    for key, values in deltas.items():
+        target = into.setdefault(key, dict.fromkeys(FIELDS, 0))
+        for field, value in values.items():
+            target[field] += sign * value
+
+
+def _lock_workspaces(cursor, workspace_ids):
+    """
+    KEY SHARE lock the workspaces whose rows a booking write changes. It
+    doesn't block other booking writes, only rebuild()'s FOR UPDATE, so a
+    rebuild waits for in-flight writes and later writes wait for it.
+    """
+    cursor.execute(
+        f"SELECT 1 FROM {Workspace._meta.db_table} WHERE id = ANY(%s) ORDER BY id FOR KEY SHARE",
+        [sorted(workspace_ids)],
+    )
+
+
+def _apply(deltas, insert):
+    rows = [
+        (org_id, workspace_id, day, *(values[field] for field in FIELDS))
+        for (org_id, workspace_id, day), values in deltas.items()
+        if any(values.values())
+    ]
+    if not rows:
+        return
+    table = BookingDailyStat._meta.db_table
+    increments = ', '.join(f'{field} = {table}.{field} + EXCLUDED.{field}' for field in FIELDS)
+    with connection.cursor() as cursor:
+        _lock_workspaces(cursor, {row[1] for row in rows})
+        if insert:
+            cursor.executemany(
+                f"INSERT INTO {table} (organization_id, workspace_id, day, {', '.join(FIELDS)}) "
+                f"VALUES (%s, %s, %s, %s, %s, %s, %s) "
+                f"ON CONFLICT (workspace_id, day) DO UPDATE SET {increments}",
+                rows,
+            )
+        else:
+            # Deletes only ever subtract from existing rows. Not inserting also
+            # keeps a cascading workspace delete from recreating its stats.
+            cursor.executemany(
+                f"UPDATE {table} SET {', '.join(f'{field} = {field} + %s' for field in FIELDS)} "
+                f"WHERE workspace_id = %s AND day = %s",
+                [(*row[3:], row[1], row[2]) for row in rows],
+            )
+
+
+def record_save(previous, current):
+    deltas = {}
+    if previous is not None:
+        _merge(deltas, contribution(previous), -1)
+    _merge(deltas, contribution(current), 1)
+    _apply(deltas, insert=True)
+
+
+def record_delete(previous):
+    deltas = {}
+    _merge(deltas, contribution(previous), -1)
+    _apply(deltas, insert=False)
+
+
+def rebuild(organization=None, since=None, apps=global_apps):
+    """
+    Recompute rollups from bookings, for one organization and/or from
+    `since` (a date) onwards. Returns the number of rows written.
+
+    The organization's workspaces are locked first, so booking writes that
+    haven't committed yet apply their deltas after the rebuilt rows are in
+    (see _lock_workspaces). `apps` lets a data migration pass its
+    historical models.
+    """
+    Booking = apps.get_model('workspace', 'Booking')
+    BookingDailyStat = apps.get_model('workspace', 'BookingDailyStat')
+    Workspace = apps.get_model('workspace', 'Workspace')
+
+    workspaces = Workspace.objects.all()
+    bookings = Booking.objects.all()
+    stats = BookingDailyStat.objects.all()
+    if organization is not None:
+        workspaces = workspaces.filter(organization=organization)
+        bookings = bookings.filter(organization=organization)
+        stats = stats.filter(organization=organization)
+
+    created = bookings.annotate(day=TruncDate('created_at'))
+    started = bookings.annotate(day=TruncDate('start_time'))
+    if since is not None:
+        created = created.filter(day__gte=since)
+        started = started.filter(day__gte=since)
+        stats = stats.filter(day__gte=since)
+
+    with transaction.atomic():
+        list(workspaces.select_for_update().values_list('id', flat=True))
+
+        totals = {}
+        for row in created.values('organization_id', 'workspace_id', 'day').annotate(n=Count('id')).order_by():
+            _merge(totals, {(row['organization_id'], row['workspace_id'], row['day']): {'created': row['n']}}, 1)
+        started = started.values('organization_id', 'workspace_id', 'day').annotate(
+            cancelled=Count('id', filter=Q(status='CANCELLED')),
+            completed=Count('id', filter=Q(status='COMPLETED')),
+            # Floored per booking, as contribution() does.
+            minutes=Sum(
+                Floor(Extract(F('end_time') - F('start_time'), 'epoch') / 60),
+                filter=~Q(status='CANCELLED'),
+            ),
+        ).order_by()
+        for row in started:
+            _merge(totals, {(row['organization_id'], row['workspace_id'], row['day']): {
+                'cancelled': row['cancelled'],
+                'completed': row['completed'],
+                'booked_minutes': int(row['minutes'] or 0),
+            }}, 1)
+
+        stats.delete()
+        BookingDailyStat.objects.bulk_create(
+            [
+                BookingDailyStat(organization_id=org_id, workspace_id=workspace_id, day=day, **values)
+                for (org_id, workspace_id, day), values in totals.items()
+            ],
+            batch_size=1000,
+        )
+    return len(totals)
+
+
+def window_start(window):
+    """First day of a '7' / '30' / '90' / 'all' window ending today, or None for all time."""
+    days = WINDOWS[window]
+    if days is None:
+        return None
+    return timezone.localdate() - timedelta(days=days - 1)
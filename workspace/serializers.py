@@ -1,15 +1,18 @@
 from rest_framework import serializers
+from core.fieldsets import SparseFieldsetMixin
 from .models import Workspace, Booking
 
 
-class WorkspaceSerializer(serializers.ModelSerializer):
+class WorkspaceSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     is_available = serializers.ReadOnlyField()
+    # Only present with ?q=...&highlight=1 (FullTextSearchFilter).
+    headline = serializers.ReadOnlyField()
 
     class Meta:
         model = Workspace
         fields = [
             'id', 'name', 'type',
-            'capacity', 'description', 'amenities', 'is_available'
+            'capacity', 'description', 'amenities', 'is_available', 'headline'
         ]
 
 class TopBookedWorkspaceSerializer(serializers.ModelSerializer):
@@ -53,25 +56,20 @@ class BookingAnalyticsSerializer(serializers.Serializer):
     count = serializers.IntegerField()
 
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Booking
-        fields = '__all__'
+        fields = ['id', 'workspace', 'user', 'created_at', 'start_time', 'end_time', 'updated_at', 'status']
+        read_only_fields = ['user']
 
     def validate(self, data):
-        start = data.get('start_time')
-        end = data.get('end_time')
-        workspace = data.get('workspace')
-
-        conflict = Booking.objects.filter(
-            workspace=workspace,
-            status='ACTIVE',
-        ).filter(
-            Q(start_time__lt=end) & Q(end_time__gt=start)
-        ).exists()
-
-        if conflict:
-            raise serializers.ValidationError("This workspace is already booked for the selected time.")
+        # Overlaps are rejected by the booking_no_overlap constraint on insert,
+        # the views turn that into a 409.
+        start = data.get('start_time', getattr(self.instance, 'start_time', None))
+        end = data.get('end_time', getattr(self.instance, 'end_time', None))
+
+        if start and end and end <= start:
+            raise serializers.ValidationError("End time must be after start time.")
         return data
 
 class BookingSummarySerializer(serializers.ModelSerializer):
@@ -1,7 +1,13 @@
 # signals.py
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.db import transaction
 from django.dispatch import receiver
-from .models import Booking, Workspace
+from core import versioning
+from core.caching import dashboard_cache
+from .models import Booking, Tombstone, Workspace
+from .availability import availability_index
+from .autocomplete import WORKSPACE, autocomplete_index, workspace_record
+from . import rollups, sync
 from django.utils.timezone import now
 
 @receiver(post_save, sender=Booking)
@@ -24,3 +30,70 @@ def reset_workspace_status_on_delete(sender, instance, **kwargs):
     if not overlapping:
         workspace.status = 'AVAILABLE'
         workspace.save()
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def invalidate_availability_on_booking_change(sender, instance, **kwargs):
+    availability_index.invalidate(instance.organization_id)
+
+@receiver(post_save, sender=Workspace)
+@receiver(post_delete, sender=Workspace)
+def invalidate_availability_on_workspace_change(sender, instance, **kwargs):
+    availability_index.invalidate(instance.organization_id)
+
+@receiver(post_save, sender=Workspace)
+@receiver(post_delete, sender=Workspace)
+def refresh_autocomplete_on_workspace_change(sender, instance, signal, **kwargs):
+    organization_id, pk = instance.organization_id, instance.pk
+    record = None if signal is post_delete else workspace_record(instance)
+    transaction.on_commit(lambda: autocomplete_index.refresh(organization_id, WORKSPACE, pk, record))
+
+
+@receiver(pre_save, sender=Booking)
+def remember_booking_rollup(sender, instance, raw=False, **kwargs):
+    # Also read by activity.signals to spot status changes.
+    if not raw:
+        instance._previous_snapshot = rollups.previous_snapshot(instance)
+
+@receiver(post_save, sender=Booking)
+def update_booking_rollup_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        rollups.record_save(getattr(instance, '_previous_snapshot', None), rollups.snapshot(instance))
+
+@receiver(post_delete, sender=Booking)
+def update_booking_rollup_on_delete(sender, instance, **kwargs):
+    rollups.record_delete(rollups.snapshot(instance))
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+@receiver(post_save, sender=Workspace)
+@receiver(post_delete, sender=Workspace)
+def invalidate_dashboards(sender, instance, **kwargs):
+    # After commit, so a concurrent recompute can't cache the old rows again.
+    organization_id = instance.organization_id
+    transaction.on_commit(lambda: dashboard_cache.invalidate(organization_id))
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def bump_booking_version(sender, instance, **kwargs):
+    organization_id = instance.organization_id
+    transaction.on_commit(lambda: versioning.resource_versions.bump(organization_id, versioning.BOOKING))
+
+@receiver(post_save, sender=Workspace)
+@receiver(post_delete, sender=Workspace)
+def bump_workspace_version(sender, instance, **kwargs):
+    organization_id = instance.organization_id
+    transaction.on_commit(lambda: versioning.resource_versions.bump(organization_id, versioning.WORKSPACE))
+
+
+@receiver(post_delete, sender=Booking)
+def record_booking_tombstone(sender, instance, **kwargs):
+    sync.record_deletion(instance.organization_id, Tombstone.BOOKING, instance.pk, instance.user_id)
+
+@receiver(post_delete, sender=Workspace)
+def record_workspace_tombstone(sender, instance, **kwargs):
+    sync.record_deletion(instance.organization_id, Tombstone.WORKSPACE, instance.pk)
+
@@ -0,0 +1,149 @@
+"""
+Delta sync for clients that keep a local copy of workspaces and bookings.
+
+Every row carries sync_xid, the id of the last transaction that wrote it,
+set by a trigger on every insert and update (queryset.update() too).
+A sync token holds one (sync_xid, id) position per stream: workspaces,
+bookings and tombstones. Each request first reads the horizon, the oldest
+transaction still in progress. Every transaction below it has finished,
+so no row can still appear there. The request returns the rows between
+the token's positions and the horizon, at most `limit` per stream. A
+caught-up stream's next position is the horizon. Rows from a long
+transaction are delivered once it commits, however long it took; while it
+is open it holds the horizon back, and later changes wait for it.
+
+Without a token, every live row is returned and no tombstones. A token
+whose deletions were read longer ago than the tombstone retention can't be
+trusted to list every deletion, so it is refused and the client must
+start over.
+"""
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound
+
+from core.pagination import decode_cursor, encode_cursor, keyset_filter
+from users.authentication import MANAGE_BOOKINGS
+from .models import Booking, Tombstone, Workspace
+
+DEFAULT_RETENTION_DAYS = 90
+STREAMS = ('workspaces', 'bookings', 'deleted')
+
+
+class SyncTokenExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "This sync token has expired; sync again without a token."
+    default_code = 'sync_token_expired'
+
+
+def retention():
+    return timedelta(days=getattr(settings, 'SYNC_TOMBSTONE_RETENTION_DAYS', DEFAULT_RETENTION_DAYS))
+
+
+def record_deletion(organization_id, model, object_id, user_id=None):
+    Tombstone.objects.create(organization_id=organization_id, model=model, object_id=object_id, user_id=user_id)
+
+
+def purge_tombstones():
+    return Tombstone.objects.filter(deleted_at__lt=timezone.now() - retention()).delete()[0]
+
+
+def horizon():
+    """Transaction ids below this one belong to finished transactions."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+        return cursor.fetchone()[0]
+
+
+def decode_token(token):
+    """
+    Returns ({stream: (sync_xid, id)}, deletions_as_of). The token ends
+    with the time the deleted stream was last known to be complete.
+    """
+    values = decode_cursor(token)
+    if len(values) == 2 * len(STREAMS):
+        # Timestamp positions from before sync_xid; they can't be resumed.
+        raise SyncTokenExpired()
+    if len(values) != 2 * len(STREAMS) + 1:
+        raise NotFound("Invalid cursor")
+    positions = {}
+    for i, stream in enumerate(STREAMS):
+        xid, last_id = values[2 * i:2 * i + 2]
+        if not isinstance(xid, int) or not isinstance(last_id, int):
+            raise NotFound("Invalid cursor")
+        positions[stream] = (xid, last_id)
+    try:
+        deletions_as_of = datetime.fromisoformat(values[-1])
+    except (TypeError, ValueError):
+        raise NotFound("Invalid cursor")
+    # Tombstones past the retention may have been purged already.
+    if deletions_as_of < timezone.now() - retention():
+        raise SyncTokenExpired()
+    return positions, deletions_as_of
+
+
+def encode_token(positions, deletions_as_of):
+    return encode_cursor([value for stream in STREAMS for value in positions[stream]] + [deletions_as_of])
+
+
+def _page(queryset, position, until, limit):
+    queryset = queryset.filter(sync_xid__lt=until).order_by('sync_xid', 'id')
+    if position is not None:
+        queryset = queryset.filter(keyset_filter(('sync_xid', 'id'), position))
+    rows = list(queryset[:limit + 1])
+    return rows[:limit], len(rows) > limit
+
+
+def changes(request, organization, token=None, limit=500):
+    """
+    Returns (workspaces, bookings, tombstones, next_token, more). Clients
+    only see their own bookings; principals with MANAGE_BOOKINGS see the
+    whole organization's. Other principals see none, since only ClientUser
+    ids match Booking.user_id.
+    """
+    started = timezone.now()
+    if token:
+        positions, deletions_as_of = decode_token(token)
+    else:
+        positions, deletions_as_of = dict.fromkeys(STREAMS), started
+    until = horizon()
+
+    workspaces = Workspace.objects.filter(organization=organization).with_availability()
+    bookings = Booking.objects.filter(organization=organization)
+    tombstones = Tombstone.objects.filter(organization=organization)
+    if request.user.has_perm(MANAGE_BOOKINGS):
+        pass
+    elif getattr(request.user, 'is_client', False):
+        bookings = bookings.filter(user_id=request.user.id)
+        tombstones = tombstones.filter(
+            Q(model=Tombstone.WORKSPACE) | Q(user_id=request.user.id)
+        )
+    else:
+        bookings = bookings.none()
+        tombstones = tombstones.filter(model=Tombstone.WORKSPACE)
+
+    pages = {
+        'workspaces': _page(workspaces, positions['workspaces'], until, limit),
+        'bookings': _page(bookings, positions['bookings'], until, limit),
+        # A fresh replica has nothing to delete.
+        'deleted': _page(tombstones, positions['deleted'], until, limit) if token else ([], False),
+    }
+
+    next_positions = {}
+    for stream, (rows, more) in pages.items():
+        if more:
+            last = rows[-1]
+            next_positions[stream] = (last.sync_xid, last.id)
+        else:
+            # Everything below the horizon has been read.
+            next_positions[stream] = (until, 0)
+    if not pages['deleted'][1]:
+        deletions_as_of = started
+
+    more = any(more for _, more in pages.values())
+    next_token = encode_token(next_positions, deletions_as_of)
+    return pages['workspaces'][0], pages['bookings'][0], pages['deleted'][0], next_token, more
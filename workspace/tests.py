@@ -1,3 +1,246 @@
-from django.test import TestCase
+import importlib
+import threading
+from datetime import timedelta
 
-# Create your tests here.
+from django.apps import apps as django_apps
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.pagination import encode_cursor
+from organizations.models import Organization
+from users.authentication import CLIENT, TenantPrincipal
+from users.models import ClientUser
+from . import sync
+from .models import BOOKING_NO_OVERLAP, Booking, Tombstone, Workspace
+from .views import BookingCreateView, FullTextSearchFilter, SyncChangesView
+
+
+class FullTextSearchHeadlineTests(TestCase):
+    def test_headline_escapes_stored_text(self):
+        organization = Organization.objects.create(organization_name="Acme", email="acme@example.com")
+        Workspace.objects.create(
+            organization=organization, name='Room "A" & <b>B</b>', type="Room", capacity=4,
+            description="<script>alert('x')</script> with a projector",
+        )
+        request = Request(APIRequestFactory().get('/', {'q': 'projector', 'highlight': '1'}))
+
+        workspace = FullTextSearchFilter().filter_queryset(request, Workspace.objects.all(), None).get()
+
+        self.assertIn('<mark>projector</mark>', workspace.headline)
+        self.assertNotIn('<script>', workspace.headline)
+        self.assertNotIn('<b>', workspace.headline)
+        self.assertIn('&lt;script&gt;', workspace.headline)
+
+
+class BookingOrganizationTests(TestCase):
+    def test_organization_follows_the_workspace(self):
+        acme = Organization.objects.create(organization_name="Acme", email="acme@example.com")
+        other = Organization.objects.create(organization_name="Other", email="other@example.com")
+        user = ClientUser.objects.create(organization=acme, full_name="Ada", email="ada@example.com")
+        desk = Workspace.objects.create(organization=acme, name="Desk", type="Desk", capacity=1)
+        elsewhere = Workspace.objects.create(organization=other, name="Desk", type="Desk", capacity=1)
+        start = timezone.now() + timedelta(days=1)
+        booking = Booking.objects.create(workspace=desk, user=user, start_time=start, end_time=start + timedelta(hours=1))
+        self.assertEqual(booking.organization_id, acme.id)
+
+        booking = Booking.objects.get(pk=booking.pk)
+        booking.status = 'CANCELLED'
+        booking.save()
+        booking.workspace_id = elsewhere.id
+        booking.save()
+
+        self.assertEqual(Booking.objects.get(pk=booking.pk).organization_id, other.id)
+
+
+class BookingOverlapTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(organization_name="Acme", email="acme@example.com")
+        cls.user = ClientUser.objects.create(organization=cls.organization, full_name="Ada", email="ada@example.com")
+        cls.desk = Workspace.objects.create(organization=cls.organization, name="Desk", type="Desk", capacity=1)
+        cls.start = (timezone.now() + timedelta(days=1)).replace(microsecond=0)
+
+    def book(self, start, end):
+        request = APIRequestFactory().post('/', {
+            'workspace': self.desk.id, 'start_time': start.isoformat(), 'end_time': end.isoformat(),
+        }, format='json')
+        request.organization = self.organization
+        request.org_code = self.organization.code
+        force_authenticate(request, user=TenantPrincipal(
+            self.user.id, CLIENT, 'member', self.organization.id, self.organization.code, self.user.email,
+        ))
+        return BookingCreateView.as_view()(request, org_code=self.organization.code)
+
+    def test_overlapping_booking_is_a_conflict(self):
+        hour = timedelta(hours=1)
+        self.assertEqual(self.book(self.start, self.start + 2 * hour).status_code, 201)
+
+        response = self.book(self.start + hour, self.start + 3 * hour)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['detail'].code, 'booking_conflict')
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_adjacent_and_cancelled_bookings_dont_conflict(self):
+        hour = timedelta(hours=1)
+        self.assertEqual(self.book(self.start, self.start + hour).status_code, 201)
+        # Ranges are [start, end), so back to back is fine.
+        self.assertEqual(self.book(self.start + hour, self.start + 2 * hour).status_code, 201)
+
+        Booking.objects.filter(start_time=self.start).update(status='CANCELLED')
+        self.assertEqual(self.book(self.start, self.start + hour).status_code, 201)
+
+
+class ResolveExistingOverlapsTests(TestCase):
+    """Migration 0012 cancels legacy double bookings before adding the constraint."""
+
+    def test_later_overlapping_bookings_are_cancelled(self):
+        migration = importlib.import_module('workspace.migrations.0012_booking_period_no_overlap')
+        constraint = next(c for c in Booking._meta.constraints if c.name == BOOKING_NO_OVERLAP)
+        organization = Organization.objects.create(organization_name="Acme", email="acme@example.com")
+        user = ClientUser.objects.create(organization=organization, full_name="Ada", email="ada@example.com")
+        desk = Workspace.objects.create(organization=organization, name="Desk", type="Desk", capacity=1)
+        room = Workspace.objects.create(organization=organization, name="Room", type="Room", capacity=4)
+        start = timezone.now() + timedelta(days=1)
+        hour = timedelta(hours=1)
+
+        # DDL is transactional in Postgres, so this is undone with the test.
+        with connection.schema_editor() as editor:
+            editor.remove_constraint(Booking, constraint)
+
+        def book(workspace, offset, hours, status='PENDING'):
+            return Booking.objects.create(
+                workspace=workspace, user=user, status=status,
+                start_time=start + offset * hour, end_time=start + (offset + hours) * hour,
+            )
+
+        first = book(desk, 0, 3)
+        inside = book(desk, 1, 1)
+        straddling = book(desk, 2, 2)
+        after = book(desk, 3, 1)
+        already_cancelled = book(desk, 0, 1, status='CANCELLED')
+        other_workspace = book(room, 0, 3)
+
+        migration.resolve_existing_overlaps(django_apps, None)
+
+        statuses = dict(Booking.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses[first.pk], 'PENDING')
+        self.assertEqual(statuses[inside.pk], 'CANCELLED')
+        self.assertEqual(statuses[straddling.pk], 'CANCELLED')
+        self.assertEqual(statuses[after.pk], 'PENDING')
+        self.assertEqual(statuses[already_cancelled.pk], 'CANCELLED')
+        self.assertEqual(statuses[other_workspace.pk], 'PENDING')
+        with connection.schema_editor() as editor:
+            editor.add_constraint(Booking, constraint)
+
+
+class DeltaSyncTests(TransactionTestCase):
+    """
+    workspace.sync reads sync_xid, which only committed transactions can
+    move past the horizon, so these tests commit for real.
+    """
+
+    def setUp(self):
+        self.organization = Organization.objects.create(organization_name="Acme", email="acme@example.com")
+        self.user = ClientUser.objects.create(
+            organization=self.organization, full_name="Ada", email="ada@example.com", is_staff=True,
+        )
+        self.principal = TenantPrincipal(
+            self.user.id, CLIENT, 'staff', self.organization.id, self.organization.code, self.user.email,
+        )
+
+    def sync(self, token=None, expected_status=200):
+        request = APIRequestFactory().get('/', {'since': token} if token else {})
+        request.organization = self.organization
+        request.org_code = self.organization.code
+        force_authenticate(request, user=self.principal)
+        response = SyncChangesView.as_view()(request, org_code=self.organization.code)
+        self.assertEqual(response.status_code, expected_status, response.data)
+        return response.data
+
+    def workspace(self, name):
+        return Workspace.objects.create(organization=self.organization, name=name, type="Desk", capacity=1)
+
+    def test_full_sync_then_deltas(self):
+        desk = self.workspace("Desk")
+        data = self.sync()
+        self.assertEqual([row['id'] for row in data['workspaces']], [desk.id])
+        self.assertFalse(data['more'])
+
+        data = self.sync(data['next'])
+        self.assertEqual(data['workspaces'], [])
+
+        # queryset.update() bypasses save(), but the trigger still moves sync_xid.
+        Workspace.objects.filter(pk=desk.pk).update(name="Standing desk")
+        data = self.sync(data['next'])
+        self.assertEqual([row['name'] for row in data['workspaces']], ["Standing desk"])
+
+    def test_write_behind_an_older_open_transaction_is_not_skipped(self):
+        token = self.sync()['next']
+        started = threading.Event()
+        release = threading.Event()
+
+        def long_transaction():
+            try:
+                with transaction.atomic():
+                    self.workspace("Slow")
+                    started.set()
+                    release.wait(10)
+            finally:
+                connection.close()
+
+        worker = threading.Thread(target=long_transaction)
+        worker.start()
+        try:
+            self.assertTrue(started.wait(10))
+            # Committed now, but by a later transaction than the open one.
+            self.workspace("Fast")
+            data = self.sync(token)
+            # Held back behind the open transaction, not delivered ahead of it.
+            self.assertEqual(data['workspaces'], [])
+            token = data['next']
+        finally:
+            release.set()
+            worker.join()
+
+        data = self.sync(token)
+        self.assertEqual(sorted(row['name'] for row in data['workspaces']), ["Fast", "Slow"])
+        self.assertEqual(self.sync(data['next'])['workspaces'], [])
+
+    def test_deletions_are_sent_then_purged(self):
+        desk = self.workspace("Desk")
+        start = timezone.now() + timedelta(days=1)
+        booking = Booking.objects.create(
+            workspace=desk, user=self.user, start_time=start, end_time=start + timedelta(hours=1),
+        )
+        token = self.sync()['next']
+
+        booking.delete()
+        desk.delete()
+        data = self.sync(token)
+        self.assertEqual(data['deleted'], {'workspaces': [desk.id], 'bookings': [booking.id]})
+        self.assertEqual(self.sync(data['next'])['deleted'], {'workspaces': [], 'bookings': []})
+
+        # A fresh replica has nothing to delete.
+        self.assertEqual(self.sync()['deleted'], {'workspaces': [], 'bookings': []})
+
+        Tombstone.objects.update(deleted_at=timezone.now() - sync.retention() - timedelta(days=1))
+        self.assertEqual(sync.purge_tombstones(), 2)
+        self.assertFalse(Tombstone.objects.exists())
+
+    def test_expired_or_invalid_tokens_need_a_full_resync(self):
+        desk = self.workspace("Desk")
+        positions = dict.fromkeys(sync.STREAMS, (0, 0))
+        expired = sync.encode_token(positions, timezone.now() - sync.retention() - timedelta(days=1))
+
+        data = self.sync(expired, expected_status=410)
+        self.assertEqual(data['detail'].code, 'sync_token_expired')
+        self.sync('not-a-token', expected_status=404)
+        self.sync(encode_cursor([1, 2, 3]), expected_status=404)
+
+        data = self.sync()
+        self.assertEqual([row['id'] for row in data['workspaces']], [desk.id])
+        self.sync(data['next'])
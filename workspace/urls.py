@@ -1,12 +1,16 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (WorkspaceViewSet,
+                    check_availability,
                     BookingDetailView,
                     BookingCreateView,
                     #AdminToggleWorkspaceView,
                     TopBookedWorkspacesView,
+                    BookingAnalyticsView,
                     UpcomingBookingsView,
-                    RecentActivitiesView
+                    RecentActivitiesView,
+                    SyncChangesView,
+                    AutocompleteView
                     )
 
 router = DefaultRouter()
@@ -15,9 +19,13 @@ router.register(r'workspaces', WorkspaceViewSet, basename='workspace')
 
 urlpatterns = [
     path('api/', include(router.urls)),
+    path('availability/', check_availability, name='check-availability'),
     path('bookings/<int:pk>/', BookingDetailView.as_view(), name='booking-detail'),
     path('bookings/', BookingCreateView.as_view(), name='booking-create'),
+    path('autocomplete/', AutocompleteView.as_view(), name='autocomplete'),
+    path('changes/', SyncChangesView.as_view(), name='sync-changes'),
     path('notification/top-booked-workspaces/', TopBookedWorkspacesView.as_view(), name='top-booked-workspaces'),
+    path('notification/booking-analytics/', BookingAnalyticsView.as_view(), name='booking-analytics'),
     path('notification/upcoming-bookings/', UpcomingBookingsView.as_view(), name='upcoming-bookings'),
     path('notification/recent-activities/', RecentActivitiesView.as_view(), name='recent-activities'),
     #path('notification/workspace/toggle/', AdminToggleWorkspaceView.as_view(), name='toggle-workspaces'),
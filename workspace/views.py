@@ -1,58 +1,111 @@
 from rest_framework import generics, permissions, filters, viewsets
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
-from django.db.models import Q
-from django.utils.dateparse import parse_datetime
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.utils.dateparse import parse_date, parse_datetime
 from django.utils import timezone
 from datetime import datetime, timedelta
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.filters import BaseFilterBackend
-from django.contrib.postgres.search import TrigramSimilarity
-from rest_framework.exceptions import NotFound, ValidationError
-from .models import Workspace, Booking
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, TrigramSimilarity
+from django.db.models.functions import Cast, Coalesce, Concat, Replace
+from rest_framework.exceptions import APIException, NotFound, ValidationError
+from rest_framework import status
+from django.db import IntegrityError, transaction
+from .models import Workspace, Booking, BookingDailyStat, BOOKING_NO_OVERLAP, SEARCH_CONFIG
 from .filters import WorkspaceFilter, BookingFilter
 from .serializers import WorkspaceSerializer, BookingSerializer
-from organizations.models import Organization
+from .availability import availability_index, aware
+from .autocomplete import KINDS, autocomplete_index
+from . import rollups, sync
 from rest_framework.views import APIView
 from django.utils.timezone import now
 from django.db.models.functions import TruncDate
-from users.models import ClientUser
-from django.db.models import Count
-from django.shortcuts import get_object_or_404
-from users.serializers import ClientUserSerializer
+from activity.models import ActivityEvent
+from django.db.models import Count, Sum
+from users.authentication import MANAGE_BOOKINGS
+from users.permissions import BelongsToOrganization, IsClientUser
+from core.caching import dashboard_cache
+from core import versioning
+from core.fast_serializers import FastListMixin
+from core.fieldsets import SparseQuerysetMixin
+from core.pagination import KeysetPagination, KeysetPaginationMixin
+from core.versioning import ConditionalListMixin
+from core.timing import server_timing, time_queries
+
+UPCOMING_WINDOW_DAYS = 30
+
+RECENT_ACTIVITY_PER_TYPE = 50  # the activity feed pages through the rest
+
+
+class BookingConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "This workspace is already booked for the selected time."
+    default_code = 'booking_conflict'
+
+
+def save_booking(serializer, **kwargs):
+    # The overlap check lives in the database, so concurrent writers can't
+    # both win; a savepoint keeps the surrounding transaction usable.
+    try:
+        with transaction.atomic():
+            return serializer.save(**kwargs)
+    except IntegrityError as exc:
+        diag = getattr(exc.__cause__, 'diag', None)
+        if getattr(diag, 'constraint_name', None) == BOOKING_NO_OVERLAP:
+            raise BookingConflict()
+        raise
+
+def availability_as_of(request):
+    value = request.query_params.get('as_of')
+    if not value:
+        return timezone.now()
+    as_of = parse_datetime(value)
+    if as_of is None:
+        raise ValidationError({'as_of': "Enter a valid ISO 8601 datetime."})
+    return aware(as_of)
 
-one_week_ago = timezone.now() - timedelta(days=7)
 
 @api_view(['GET'])
-def check_availability(request):
+def check_availability(request, org_code):
+    organization = getattr(request, 'organization', None)
+    if not organization:
+        raise NotFound("Organization not found.")
+
+    etag = versioning.compute_etag(request, (versioning.WORKSPACE, versioning.BOOKING))
+    if versioning.not_modified(request, etag):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
     workspace_id = request.query_params.get('workspace_id')
-    start = parse_datetime(request.query_params.get('start_time'))
-    end = parse_datetime(request.query_params.get('end_time'))
+    start = parse_datetime(request.query_params.get('start_time') or '')
+    end = parse_datetime(request.query_params.get('end_time') or '')
 
-    if not all([workspace_id, start, end]):
+    if not all([workspace_id, start, end]) or not workspace_id.isdigit():
         return Response({'error': 'Missing parameters'}, status=400)
 
-    conflicts = Booking.objects.filter(
-        workspace_id=workspace_id,
-        status='ACTIVE',
-        workspace__organization__code=request.org_code
-    ).filter(
-        Q(start_time__lt=end) & Q(end_time__gt=start)
-    ).exists()
+    if int(workspace_id) not in availability_index.timeline(organization.id).workspace_ids:
+        raise NotFound("Workspace not found.")
 
-    return Response({'available': not conflicts})
+    available = availability_index.is_available(organization.id, workspace_id, start, end)
+    return Response({'available': available}, headers={'ETag': etag})
 
 
-class BookingDetailView(generics.RetrieveUpdateDestroyAPIView):
+class BookingDetailView(SparseQuerysetMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = BookingSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, BelongsToOrganization]
 
     def get_queryset(self):
         qs = Booking.objects.filter(workspace__organization__code=self.request.org_code)
-        if self.request.user.is_staff:
+        if self.request.user.has_perm(MANAGE_BOOKINGS):
             return qs
-        return qs.filter(user=self.request.user)
+        if not getattr(self.request.user, 'is_client', False):
+            # Admin ids are a separate id space from ClientUser ids.
+            return qs.none()
+        return qs.filter(user_id=self.request.user.id)
+
+    def perform_update(self, serializer):
+        save_booking(serializer)
 
 
 class WorkspaceCreateView(generics.CreateAPIView):
@@ -71,25 +124,85 @@ class StandardPagination(PageNumberPagination):
 
 
 class FuzzySearchFilter(BaseFilterBackend):
+    """
+    Matches with name % 'q' (threshold: WORKSPACE_SEARCH_THRESHOLD, passed
+    as a connection option in settings) or a name prefix, both served by the
+    trigram indexes; similarity is only computed for matched rows. Exact
+    names rank first, then prefixes, then by similarity.
+    """
     def filter_queryset(self, request, queryset, view):
-        search_query = request.query_params.get('search', None)
+        search_query = request.query_params.get('search', '').strip()
         if search_query:
-            return queryset.annotate(
-                similarity=TrigramSimilarity('name', search_query)
-            ).filter(similarity__gt=0.2).order_by('-similarity')
+            return queryset.filter(
+                Q(name__trigram_similar=search_query) | Q(name__istartswith=search_query)
+            ).annotate(
+                similarity=TrigramSimilarity('name', search_query),
+                search_rank=Cast(Case(
+                    When(name__iexact=search_query, then=Value(2.0)),
+                    When(name__istartswith=search_query, then=Value(1.0)),
+                    default=Value(0.0),
+                    output_field=FloatField(),
+                ) + F('similarity'), FloatField()),
+            ).order_by('-search_rank', 'id')
         return queryset
 
 
-class WorkspaceViewSet(viewsets.ModelViewSet):
+# Same replacements as django.utils.html.escape(), & first.
+HTML_ESCAPES = (('&', '&amp;'), ('<', '&lt;'), ('>', '&gt;'), ('"', '&quot;'), ("'", '&#x27;'))
+
+
+def html_escaped(expression):
+    for char, entity in HTML_ESCAPES:
+        expression = Replace(expression, Value(char), Value(entity))
+    return expression
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    ?q= full-text search (web search syntax: "quiet room" -kitchen) over
+    the stored search_vector, ranked by ts_rank. ?highlight=1 adds a
+    `headline` of the name and description with matches wrapped in <mark>.
+    The text is HTML-escaped first, so <mark> is the only markup in it.
+    """
+    search_param = 'q'
+    highlight_param = 'highlight'
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '').strip()
+        if not text:
+            return queryset
+        query = SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
+        queryset = queryset.filter(search_vector=query).annotate(
+            # ts_rank is a real; keyset cursors need a double (see core.pagination).
+            search_rank=Cast(SearchRank(F('search_vector'), query), FloatField()),
+        )
+        if request.query_params.get(self.highlight_param) in ('1', 'true'):
+            queryset = queryset.annotate(headline=SearchHeadline(
+                html_escaped(Concat('name', Value(' — '), Coalesce('description', Value('')))),
+                query,
+                config=SEARCH_CONFIG,
+                start_sel='<mark>',
+                stop_sel='</mark>',
+                max_fragments=2,
+            ))
+        return queryset.order_by('-search_rank', 'id')
+
+
+class WorkspaceViewSet(ConditionalListMixin, FastListMixin, SparseQuerysetMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
     serializer_class = WorkspaceSerializer
     pagination_class = StandardPagination
+    # is_available also moves with the clock, not just with writes.
+    etag_resources = (versioning.WORKSPACE, versioning.BOOKING)
+    etag_time_bucket = 60
+    keyset_ordering = ('name', 'id')
     filter_backends = [
         DjangoFilterBackend,
         filters.OrderingFilter,
         FuzzySearchFilter,
+        FullTextSearchFilter,
     ]
     filterset_class = WorkspaceFilter
-    ordering_fields = ['name', 'capacity', 'type']
+    ordering_fields = ['name', 'capacity', 'type', 'is_available']
 
     def perform_create(self, serializer):
         organization = getattr(self.request, 'organization', None)
@@ -101,23 +214,31 @@ class WorkspaceViewSet(viewsets.ModelViewSet):
         organization = getattr(self.request, 'organization', None)
         if not organization:
             return Workspace.objects.none()
-        return Workspace.objects.filter(organization=organization)
+        return Workspace.objects.filter(organization=organization).with_availability(
+            availability_as_of(self.request)
+        )
 
-class WorkspaceListView(generics.ListAPIView):
+class WorkspaceListView(ConditionalListMixin, FastListMixin, SparseQuerysetMixin, KeysetPaginationMixin, generics.ListAPIView):
     serializer_class = WorkspaceSerializer
     permission_classes = [permissions.IsAuthenticated]
+    etag_resources = (versioning.WORKSPACE, versioning.BOOKING)
+    etag_time_bucket = 60
     filter_backends = [
         DjangoFilterBackend,
         filters.OrderingFilter,
-        filters.SearchFilter,
+        FullTextSearchFilter,
     ]
     filterset_class = WorkspaceFilter
-    ordering_fields = ['name', 'type', 'capacity']
+    ordering_fields = ['name', 'type', 'capacity', 'is_available']
     ordering = ['name']
 
     def get_queryset(self):
-        org_code = self.request.org_code
-        queryset = Workspace.objects.filter(organization__code=org_code)
+        organization = getattr(self.request, 'organization', None)
+        if not organization:
+            return Workspace.objects.none()
+        queryset = Workspace.objects.filter(organization=organization).with_availability(
+            availability_as_of(self.request)
+        )
 
         date = self.request.query_params.get('date')
         start_time = self.request.query_params.get('start_time')
@@ -131,37 +252,102 @@ class WorkspaceListView(generics.ListAPIView):
                 start = datetime.strptime(start_time, "%Y-%m-%dT%H:%M")
                 end = datetime.strptime(end_time, "%Y-%m-%dT%H:%M")
 
-            booked_ids = Booking.objects.filter(
-                Q(start_time__lt=end, end_time__gt=start),
-                workspace__organization__code=org_code
-            ).values_list('workspace_id', flat=True)
-
-            queryset = queryset.exclude(id__in=booked_ids)
+            free_ids = availability_index.available_workspace_ids(organization.id, start, end)
+            queryset = queryset.filter(id__in=free_ids)
 
         return queryset
 
 
+class SyncChangesView(APIView):
+    """
+    Delta sync: workspaces and bookings changed, and ids deleted, since
+    ?since=<token>. Send back `next` until `more` is false. See
+    workspace.sync.
+    """
+    permission_classes = [permissions.IsAuthenticated, BelongsToOrganization]
+    max_limit = 1000
+
+    def get(self, request, org_code):
+        organization = request.organization
+        if organization is None:
+            raise NotFound("Organization not found.")
+        try:
+            limit = min(max(int(request.query_params.get('limit', 500)), 1), self.max_limit)
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer."})
+
+        workspaces, bookings, tombstones, token, more = sync.changes(
+            request, organization, request.query_params.get('since'), limit
+        )
+        deleted = {'workspaces': [], 'bookings': []}
+        for tombstone in tombstones:
+            deleted[f'{tombstone.model}s'].append(tombstone.object_id)
+        return Response({
+            "workspaces": WorkspaceSerializer(workspaces, many=True).data,
+            "bookings": BookingSerializer(bookings, many=True).data,
+            "deleted": deleted,
+            "next": token,
+            "more": more,
+        })
+
+
+class AutocompleteView(APIView):
+    """
+    Prefix matches over workspace names and colleagues' names and emails,
+    for pickers that search on every keystroke: ?q=ro&type=workspace.
+    Served from workspace.autocomplete without queries once warm.
+    """
+    permission_classes = [permissions.IsAuthenticated, BelongsToOrganization]
+    default_limit = 10
+    max_limit = 50
+
+    def get(self, request, org_code):
+        organization = request.organization
+        if organization is None:
+            raise NotFound("Organization not found.")
+        kind = request.query_params.get('type') or None
+        if kind is not None and kind not in KINDS:
+            raise ValidationError({"type": f"Must be one of: {', '.join(KINDS)}."})
+        try:
+            limit = min(max(int(request.query_params.get('limit', self.default_limit)), 1), self.max_limit)
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer."})
+
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"results": []})
+        return Response({"results": autocomplete_index.search(organization.id, query, kind, limit)})
+
+
 class BookingCreateView(generics.CreateAPIView):
     serializer_class = BookingSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, IsClientUser, BelongsToOrganization]
 
     def get_queryset(self):
-        return Booking.objects.filter(user=self.request.user, workspace__organization__code=self.request.org_code)
+        return Booking.objects.filter(user_id=self.request.user.id, workspace__organization__code=self.request.org_code)
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        workspace = serializer.validated_data['workspace']
+        if workspace.organization_id != self.request.organization.id:
+            raise ValidationError({'workspace': "Workspace not found in this organization."})
+        save_booking(serializer, user_id=self.request.user.id)
 
 
-class BookingListView(generics.ListAPIView):
+class BookingListView(ConditionalListMixin, FastListMixin, SparseQuerysetMixin, KeysetPaginationMixin, generics.ListAPIView):
     serializer_class = BookingSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    keyset_ordering = ('start_time', 'id')
+    etag_resources = (versioning.BOOKING,)
+    etag_per_user = True
+    permission_classes = [permissions.IsAuthenticated, IsClientUser, BelongsToOrganization]
 
     def get_queryset(self):
-        return Booking.objects.filter(user=self.request.user, workspace__organization__code=self.request.org_code)
+        return Booking.objects.filter(user_id=self.request.user.id, workspace__organization__code=self.request.org_code)
 
 
-class BookingViewSet(viewsets.ModelViewSet):
+class BookingViewSet(ConditionalListMixin, FastListMixin, SparseQuerysetMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
     serializer_class = BookingSerializer
+    keyset_ordering = ('start_time', 'id')
+    etag_resources = (versioning.BOOKING,)
     filter_backends = [DjangoFilterBackend]
     filterset_class = BookingFilter
 
@@ -177,13 +363,12 @@ class AdminToggleWorkspaceView(APIView):
         if action not in ["disable", "enable"]:
             return Response({"detail": "Invalid action please use 'disable' or 'enable' "}, status=400)
 
-        try:
-            organization = Organization.objects.get(code=org_code)
-        except Organization.DoesNotExist:
+        organization = request.organization
+        if organization is None:
             return Response({"detail": "Organization not found"}, status=404)
 
         user = request.user
-        if not user.is_authenticated or user.organization != organization or not user.is_super_admin:
+        if not user.is_authenticated or not user.belongs_to(organization) or not user.is_super_admin:
             return Response({"detail": "Unauthorized"}, status=403)
 
         if action == "disable":
@@ -204,89 +389,208 @@ class AdminToggleWorkspaceView(APIView):
             return Response({"detail": "All workspaces enabled."}, status=200)
 
 class TopBookedWorkspacesView(APIView):
+    """
+    Most booked workspaces over ?window=7|30|90|all (default all), read from
+    the daily rollups rather than counting the booking history.
+    """
+    @dashboard_cache.cached('top-booked-workspaces', vary_on=('window',))
     def get(self, request, org_code, *args, **kwargs):
-        organization = get_object_or_404(Organization, code=org_code)
+        organization = request.organization
+        if organization is None:
+            raise NotFound("Organization not found.")
+        window = request.query_params.get('window', 'all')
+        if window not in rollups.WINDOWS:
+            raise ValidationError({"window": f"Use one of: {', '.join(rollups.WINDOWS)}."})
+
+        stats = BookingDailyStat.objects.filter(organization=organization)
+        since = rollups.window_start(window)
+        if since is not None:
+            stats = stats.filter(day__gte=since)
         top_workspaces = (
-            Workspace.objects.filter(organization=organization)  # filter by org
-            .annotate(bookings_count=Count('bookings'))
-            .order_by('-bookings_count')[:10]
-            .values('id', 'name', 'bookings_count')
+            stats.values('workspace_id', 'workspace__name')
+            .annotate(bookings_count=Sum('created'), booked_minutes=Sum('booked_minutes'))
+            .filter(bookings_count__gt=0)
+            .order_by('-bookings_count', 'workspace_id')[:10]
         )
-        return Response(top_workspaces, status=200)
+        return Response([
+            {
+                "id": row['workspace_id'],
+                "name": row['workspace__name'],
+                "bookings_count": row['bookings_count'],
+                "booked_minutes": row['booked_minutes'],
+            }
+            for row in top_workspaces
+        ], status=200)
+
+
+class BookingAnalyticsView(APIView):
+    """
+    Per-day booking counts between ?start= and ?end= (dates, inclusive,
+    default the last 30 days), optionally for one ?workspace=.
+    """
+    max_days = 366
+
+    @dashboard_cache.cached('booking-analytics', vary_on=('start', 'end', 'workspace'))
+    def get(self, request, org_code, *args, **kwargs):
+        organization = request.organization
+        if organization is None:
+            raise NotFound("Organization not found.")
+
+        end = self._date(request, 'end') or timezone.localdate()
+        start = self._date(request, 'start') or end - timedelta(days=29)
+        if start > end:
+            raise ValidationError({"start": "Must not be after end."})
+        if (end - start).days >= self.max_days:
+            raise ValidationError({"start": f"Ranges are limited to {self.max_days} days."})
+
+        stats = BookingDailyStat.objects.filter(organization=organization, day__range=(start, end))
+        workspace = request.query_params.get('workspace')
+        if workspace:
+            try:
+                stats = stats.filter(workspace_id=int(workspace))
+            except ValueError:
+                raise ValidationError({"workspace": "Must be an integer."})
+        totals = {
+            row['day']: row
+            for row in stats.values('day').annotate(
+                created=Sum('created'),
+                cancelled=Sum('cancelled'),
+                completed=Sum('completed'),
+                booked_minutes=Sum('booked_minutes'),
+            ).order_by()
+        }
+
+        # Days without bookings have no rollup row; fill them with zeros.
+        days = []
+        for i in range((end - start).days + 1):
+            day = start + timedelta(days=i)
+            row = totals.get(day, {})
+            days.append({
+                "date": day,
+                "created": row.get('created', 0),
+                "cancelled": row.get('cancelled', 0),
+                "completed": row.get('completed', 0),
+                "booked_minutes": row.get('booked_minutes', 0),
+            })
+        return Response(days, status=200)
+
+    def _date(self, request, name):
+        value = request.query_params.get(name)
+        if not value:
+            return None
+        parsed = parse_date(value)
+        if parsed is None:
+            raise ValidationError({name: "Invalid date, use YYYY-MM-DD."})
+        return parsed
+
+
+class UpcomingBookingPagination(KeysetPagination):
+    page_size = 50
+    page_size_query_param = 'limit'
+    max_page_size = 200
+    ordering = ('start_time', 'id')
 
 
 class UpcomingBookingsView(APIView):
+    """
+    Future bookings for the organization's notification panel, a page at a
+    time. ?until= bounds the window (default UPCOMING_WINDOW_DAYS ahead),
+    ?limit= sets the page size and the response's `next` link carries the
+    cursor. Served by booking_org_status_start_idx.
+    """
+    window = timedelta(days=UPCOMING_WINDOW_DAYS)
+
     def get(self, request, org_code, *args, **kwargs):
-        organization = get_object_or_404(Organization, code=org_code)
+        organization = request.organization
+        if organization is None:
+            raise NotFound("Organization not found.")
+
+        start = now()
+        until = request.query_params.get('until')
+        if until:
+            until = parse_datetime(until)
+            if until is None:
+                raise ValidationError({"until": "Invalid datetime."})
+            until = aware(until)
+        else:
+            until = start + self.window
+
+        # Plain tuples-as-dicts rather than model instances keep memory flat
+        # for busy organizations.
         bookings = Booking.objects.filter(
-            status="Booked",
-            start_time__gte=now(),
-            workspace__organization=organization  # Filter by organization
-        ).order_by('start_time').select_related('workspace', 'user')
+            organization=organization,
+            status__in=['PENDING', 'ACTIVE'],
+            start_time__gte=start,
+            start_time__lt=until,
+        ).values(
+            'id', 'start_time', 'end_time',
+            user_email=F('user__email'),
+            workspace_name=F('workspace__name'),
+        )
 
+        paginator = UpcomingBookingPagination()
+        rows = paginator.paginate_queryset(bookings, request, view=self)
         result = [
             {
-                "user": b.user.email,
-                "workspace": b.workspace.name,
-                "start_time": b.start_time,
-                "end_time": b.end_time,
-                "duration": str(b.end_time - b.start_time)
+                "id": row['id'],
+                "user": row['user_email'],
+                "workspace": row['workspace_name'],
+                "start_time": row['start_time'],
+                "end_time": row['end_time'],
+                "duration": str(row['end_time'] - row['start_time'])
             }
-            for b in bookings
+            for row in rows
         ]
-        return Response(result, status=200)
+        return paginator.get_paginated_response(result)
 
 
 
 class RecentActivitiesView(APIView):
+    @dashboard_cache.cached('recent-activities')
     def get(self, request, org_code):
-        organization = get_object_or_404(Organization, code=org_code)
-
-        recent_bookings = Booking.objects.filter(
-            workspace__organization=organization,
-            created_at__gte=timezone.now() - timedelta(days=7)
-        ).order_by('-created_at')
-
-        recent_cancellations = Booking.objects.filter(
-            workspace__organization=organization,
-            status='cancelled',
-            updated_at__gte=one_week_ago,
-        ).order_by('-updated_at')
-
-        recent_workspaces = Workspace.objects.filter(
+        organization = request.organization
+        if organization is None:
+            raise NotFound("Organization not found.")
+
+        sections = {
+            ActivityEvent.BOOKING_CREATED: "recent_bookings",
+            ActivityEvent.BOOKING_CANCELLED: "recent_cancellations",
+            ActivityEvent.WORKSPACE_CREATED: "recent_workspaces",
+            ActivityEvent.BOOKING_COMPLETED: "completed_sessions",
+            ActivityEvent.USER_JOINED: "new_users",
+        }
+        today = timezone.localdate()
+        recent = ActivityEvent.objects.filter(
             organization=organization,
-            created_at__gte=one_week_ago
-        ).order_by('-created_at')
-
-        completed_sessions = Booking.objects.filter(
-            workspace__organization=organization,
-            status='completed',
-            updated_at__gte=timezone.now() - timedelta(days=7)
-        ).order_by('-updated_at')
-
-        new_users = ClientUser.objects.filter(
+            occurred_at__gte=timezone.now() - timedelta(days=7),
+        ).order_by('-occurred_at', '-id').values_list('type', 'data', 'occurred_at')
+        # Capped per type, so a busy booking week can't crowd out the other
+        # sections. One UNION ALL; each part is a LIMIT on activity_org_type_time_idx.
+        first, *rest = [recent.filter(type=event_type)[:RECENT_ACTIVITY_PER_TYPE] for event_type in sections]
+        events = first.union(*rest, all=True)
+        # Analytics: count of bookings per day in past 7 days
+        counts = BookingDailyStat.objects.filter(
             organization=organization,
-            date_joined__gte=one_week_ago
-        ).order_by('-date_joined')
+            day__gte=today - timedelta(days=6),
+        ).values('day').annotate(count=Sum('created')).values_list('day', 'count').order_by()
+        results, timings = time_queries({
+            'events': lambda: list(events),
+            'analytics': lambda: dict(counts),
+        })
+
+        payload = {section: [] for section in sections.values()}
+        # UNION ALL doesn't promise to keep each part's order.
+        events = sorted(results['events'], key=lambda event: event[2], reverse=True)
+        for type, data, occurred_at in events:
+            payload[sections[type]].append({**data, "occurred_at": occurred_at})
 
-        # Analytics: count of bookings per day in past 7 days
         analytics = []
         for i in range(7):
-            day = timezone.now().date() - timedelta(days=i)
-            count = Booking.objects.filter(
-                workspace__organization=organization,
-                created_at__date=day
-            ).count()
+            day = today - timedelta(days=i)
             analytics.append({
                 "date": day,
-                "count": count
+                "count": results['analytics'].get(day, 0)
             })
 
-        return Response({
-            "recent_bookings": BookingSerializer(recent_bookings, many=True).data,
-            "recent_cancellations": BookingSerializer(recent_cancellations, many=True).data,
-            "recent_workspaces": WorkspaceSerializer(recent_workspaces, many=True).data,
-            "completed_sessions": BookingSerializer(completed_sessions, many=True).data,
-            "new_users": ClientUserSerializer(new_users, many=True).data,
-            "booking_analytics": analytics
-        })
+        payload["booking_analytics"] = analytics
+        return Response(payload, headers={'Server-Timing': server_timing(timings)})